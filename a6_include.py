@@ -3,7 +3,16 @@
 # Description: Provided data structures necessary to complete the assignment.
 #              Please look through this file carefully to see what methods
 #              are available and how they're implemented.
-#              Don't modify the contents of this file.
+
+
+import marshal
+import random
+import secrets
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from functools import partial
+from operator import itemgetter
 
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
@@ -77,6 +86,25 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    def as_list(self) -> list:
+        """
+        Return the list backing the array (not a copy), for bulk passes
+        that would otherwise pay for a bounds check on every element.
+        """
+        return self._data
+
+
+def to_list(items) -> list:
+    """
+    Return the items of a DynamicArray (its backing list, not a copy),
+    or of any other iterable as a list.
+    """
+    if isinstance(items, DynamicArray):
+        return items.as_list()
+    if isinstance(items, list):
+        return items
+    return list(items)
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -96,6 +124,448 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# ------------- Production hash function family  --------------- #
+#
+# Unlike the sample functions above, these accept str, bytes and int keys,
+# spread similar keys (anagrams, sequential ids) across the table, and take
+# an optional seed so that several independent functions can be drawn from
+# the same family.
+
+_MASK64 = (1 << 64) - 1
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_PRIME64_1 = 0x9e3779b185ebca87
+_PRIME64_2 = 0xc2b2ae3d27d4eb4f
+
+
+def _key_bytes(key) -> bytes:
+    """Return the bytes hashed for a str, bytes or int key."""
+    if isinstance(key, str):
+        return key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return bytes(key)
+    if isinstance(key, int):
+        return key.to_bytes(key.bit_length() // 8 + 1, 'little', signed=True)
+    raise TypeError(f"unsupported key type: {type(key).__name__}")
+
+
+def _avalanche(hash: int) -> int:
+    """Scramble a 64-bit value so every input bit affects every output bit."""
+    hash ^= hash >> 33
+    hash = (hash * 0xff51afd7ed558ccd) & _MASK64
+    hash ^= hash >> 33
+    hash = (hash * 0xc4ceb9fe1a85ec53) & _MASK64
+    hash ^= hash >> 33
+    return hash
+
+
+def fnv1a_hash(key, seed: int = 0) -> int:
+    """64-bit FNV-1a hash of a str, bytes or int key."""
+    hash = (_FNV_OFFSET ^ seed) & _MASK64
+    for byte in _key_bytes(key):
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK64
+    return hash
+
+
+def mix_hash(key, seed: int = 0) -> int:
+    """
+    64-bit multiply-shift hash in the style of xxHash. Consumes the key
+    eight bytes at a time, and mixes small ints directly without
+    converting them to bytes.
+    """
+    if type(key) is str:
+        data = key.encode('utf-8', 'surrogatepass')
+    elif type(key) is int and -(1 << 63) <= key < (1 << 63):
+        return _avalanche((key ^ seed) & _MASK64)
+    else:
+        data = _key_bytes(key)
+
+    length = len(data)
+    if length <= 8:
+        lanes = (int.from_bytes(data, 'little'),)
+    else:
+        lanes = struct.unpack('<%dQ' % ((length + 7) // 8),
+                              data + bytes(-length % 8))
+    hash = (seed + _PRIME64_1 + length * _PRIME64_2) & _MASK64
+    for lane in lanes:
+        hash = ((hash ^ lane) * _PRIME64_1) & _MASK64
+        hash = ((hash << 31) | (hash >> 33)) & _MASK64
+    return _avalanche(hash)
+
+
+class SeededHash:
+    """
+    Hash function built on Python's builtin hash(), salted with a seed that
+    is drawn at random for each instance unless one is given. This is the
+    fastest member of the family, but note that hash() of str and bytes is
+    itself randomized per process (see PYTHONHASHSEED).
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        """Initialize the function with the given seed, or a random one."""
+        self.seed = random.getrandbits(64) if seed is None else seed & _MASK64
+
+    def __call__(self, key) -> int:
+        """Return the hash of any hashable key."""
+        return _avalanche((hash(key) ^ self.seed) & _MASK64)
+
+
+def _siphash(data: bytes, k0: int, k1: int, c_rounds: int,
+             d_rounds: int) -> int:
+    """SipHash-c-d of a byte string under the 128-bit key (k0, k1)."""
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+
+    length = len(data)
+    tail = length & 7
+    words = list(struct.unpack_from('<%dQ' % (length >> 3), data))
+    words.append(((length & 0xff) << 56)
+                 | int.from_bytes(data[length - tail:], 'little'))
+
+    mask = _MASK64
+    # Compression rounds for each word, then (at the None marker)
+    # finalization rounds, with the 64-bit rotations written out inline
+    words.append(None)
+    for word in words:
+        if word is None:
+            v2 ^= 0xff
+            word, rounds = 0, d_rounds
+        else:
+            rounds = c_rounds
+        v3 ^= word
+        for _ in range(rounds):
+            v0 = (v0 + v1) & mask
+            v1 = (((v1 << 13) | (v1 >> 51)) & mask) ^ v0
+            v0 = ((v0 << 32) | (v0 >> 32)) & mask
+            v2 = (v2 + v3) & mask
+            v3 = (((v3 << 16) | (v3 >> 48)) & mask) ^ v2
+            v0 = (v0 + v3) & mask
+            v3 = (((v3 << 21) | (v3 >> 43)) & mask) ^ v0
+            v2 = (v2 + v1) & mask
+            v1 = (((v1 << 17) | (v1 >> 47)) & mask) ^ v2
+            v2 = ((v2 << 32) | (v2 >> 32)) & mask
+        v0 ^= word
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+class KeyedHash:
+    """
+    Keyed hash function (SipHash-1-3, as CPython uses for str) over the
+    bytes of a str, bytes or int key. Without the 128-bit seed, which is
+    drawn from the operating system's secure random source for each
+    instance unless one is given, an attacker cannot craft keys that
+    collide, so user-supplied keys cannot force long chains or probe
+    sequences. Slower than the rest of the family.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        """Initialize the function with the given seed, or a random one."""
+        self.seed = secrets.randbits(128) if seed is None else seed & ((1 << 128) - 1)
+        self._k0 = self.seed & _MASK64
+        self._k1 = self.seed >> 64
+
+    def __call__(self, key) -> int:
+        """Return the hash of a str, bytes or int key."""
+        if type(key) is str:
+            data = key.encode('utf-8', 'surrogatepass')
+        else:
+            data = _key_bytes(key)
+        return _siphash(data, self._k0, self._k1, 1, 3)
+
+
+def keyed_function(function=None, seed: int = None):
+    """
+    Return the hash function a HashMap should use: the given function, or,
+    if it is None, a KeyedHash with the given (or a random) seed.
+    """
+    if function is None:
+        return KeyedHash(seed)
+    if seed is not None:
+        raise ValueError("seed only applies when function is None")
+    return function
+
+
+# ------------- Persistence helpers (saved tables)  ------------- #
+#
+# A table written to disk can only be searched by the hash function that
+# built it, so files record which function that was. Only functions whose
+# results are the same in every process can be recorded: the sample
+# functions, and fnv1a_hash, mix_hash and KeyedHash with any seed, but not
+# SeededHash, which is built on the per-process randomized hash().
+
+_SEEDED_FAMILY = {'fnv1a_hash': fnv1a_hash, 'mix_hash': mix_hash}
+_NAMED_FUNCTIONS = {'hash_function_1': hash_function_1,
+                    'hash_function_2': hash_function_2, **_SEEDED_FAMILY}
+
+
+def hash_function_id(function) -> tuple:
+    """
+    Return a (name, seed) pair identifying a hash function, from which
+    hash_function_from_id() recreates it in any process. Accepts the
+    functions listed above, including fnv1a_hash or mix_hash bound to a
+    seed with functools.partial, and wrappers of these that set __wrapped__
+    (such as MapStats.timed()). Raises ValueError for any other function.
+    """
+    while hasattr(function, '__wrapped__'):
+        function = function.__wrapped__
+    if isinstance(function, KeyedHash):
+        return 'KeyedHash', function.seed
+    if (isinstance(function, partial) and not function.args
+            and function.keywords.keys() == {'seed'}
+            and _SEEDED_FAMILY.get(getattr(function.func, '__name__', None))
+            is function.func):
+        return function.func.__name__, function.keywords['seed']
+    name = getattr(function, '__name__', None)
+    if name in _NAMED_FUNCTIONS and _NAMED_FUNCTIONS[name] is function:
+        return name, 0
+    raise ValueError(f"hash function {function!r} cannot be identified "
+                     f"across processes")
+
+
+def hash_function_from_id(name: str, seed: int = 0):
+    """Return the hash function identified by a hash_function_id() pair."""
+    if name == 'KeyedHash':
+        return KeyedHash(seed)
+    if name in _SEEDED_FAMILY and seed:
+        return partial(_SEEDED_FAMILY[name], seed=seed)
+    if name in _NAMED_FUNCTIONS:
+        return _NAMED_FUNCTIONS[name]
+    raise ValueError(f"unknown hash function: {name!r}")
+
+
+def matches_hash_function(function, identity: tuple) -> bool:
+    """
+    Return True if function is the one identified by the (name, seed) pair
+    identity, as returned by hash_function_id(), and False otherwise,
+    including when identity is None.
+    """
+    if identity is None:
+        return False
+    try:
+        return hash_function_id(function) == tuple(identity)
+    except ValueError:
+        return False
+
+
+SNAPSHOT_MAGIC = b'CS261MAP'
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot_header(file, kind: str, function, settings: dict) -> None:
+    """
+    Write the header of a HashMap snapshot to a binary file: magic bytes,
+    format version, then as marshal data the kind of map, the identity of
+    its hash function (an empty name if it has none) and its settings.
+    """
+    try:
+        name, seed = hash_function_id(function)
+    except ValueError:
+        name, seed = '', 0
+    file.write(SNAPSHOT_MAGIC + struct.pack('<I', SNAPSHOT_VERSION))
+    marshal.dump((kind, name, seed, settings), file)
+
+
+def read_snapshot_header(file, kind: str) -> tuple:
+    """
+    Read a header written by write_snapshot_header() for the given kind of
+    map. Return (identity, settings), where identity is the (name, seed)
+    pair of the hash function, or None if none was recorded. Raise
+    ValueError if the file is not a snapshot of that kind.
+    """
+    start = file.read(len(SNAPSHOT_MAGIC) + 4)
+    if (len(start) < len(SNAPSHOT_MAGIC) + 4
+            or start[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC):
+        raise ValueError("not a HashMap snapshot")
+    version = struct.unpack('<I', start[len(SNAPSHOT_MAGIC):])[0]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version: {version}")
+    saved_kind, name, seed, settings = marshal.load(file)
+    if saved_kind != kind:
+        raise ValueError(f"snapshot of a {saved_kind!r} map, not {kind!r}")
+    return ((name, seed) if name else None), settings
+
+
+def encode_key(key) -> bytes:
+    """
+    Return a str, bytes or int key as bytes tagged with its type, so that
+    keys of different types never encode alike and decode_key() can
+    restore them.
+    """
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray)):
+        return b'b' + bytes(key)
+    if isinstance(key, int):
+        return b'i' + key.to_bytes(key.bit_length() // 8 + 1, 'little',
+                                   signed=True)
+    raise TypeError(f"unsupported key type: {type(key).__name__}")
+
+
+def decode_key(data) -> object:
+    """Return the key encoded by encode_key() in the given bytes."""
+    tag, payload = data[0], data[1:]
+    if tag == ord('s'):
+        return bytes(payload).decode('utf-8', 'surrogatepass')
+    if tag == ord('b'):
+        return bytes(payload)
+    if tag == ord('i'):
+        return int.from_bytes(payload, 'little', signed=True)
+    raise ValueError(f"unknown key tag: {tag!r}")
+
+
+# ----------------- Capacity helpers (SC & OA)  ----------------- #
+
+def is_prime(capacity: int) -> bool:
+    """Return True if capacity is a prime number, False otherwise."""
+    if capacity == 2 or capacity == 3:
+        return True
+    if capacity < 2 or capacity % 2 == 0:
+        return False
+    factor = 3
+    while factor * factor <= capacity:
+        if capacity % factor == 0:
+            return False
+        factor += 2
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """Return the smallest prime number greater than or equal to capacity."""
+    if capacity <= 2:
+        return 2
+    if capacity % 2 == 0:
+        capacity += 1
+    while not is_prime(capacity):
+        capacity += 2
+    return capacity
+
+
+# ---------------- Statistics (SC & OA)  ---------------- #
+
+class MapStats:
+    """
+    Counters a HashMap records while its statistics are enabled: probes
+    per lookup, resizes and their duration, and calls to and time spent in
+    the hash function. The map only records anything while it holds one
+    of these, so a map with statistics disabled pays nothing beyond an
+    occasional check for None.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new set of counters, all zero."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter back to zero."""
+        self.lookups = 0
+        self.probes = 0
+        self.probe_histogram = {}
+        self.resizes = 0
+        self.resize_seconds = 0.0
+        self.max_resize_seconds = 0.0
+        self.hash_calls = 0
+        self.hash_seconds = 0.0
+
+    def record_probes(self, probes: int) -> None:
+        """Records a lookup that examined the given number of slots."""
+        self.lookups += 1
+        self.probes += probes
+        histogram = self.probe_histogram
+        histogram[probes] = histogram.get(probes, 0) + 1
+
+    def record_resize(self, seconds: float) -> None:
+        """Records a resize that took the given number of seconds."""
+        self.resizes += 1
+        self.resize_seconds += seconds
+        if seconds > self.max_resize_seconds:
+            self.max_resize_seconds = seconds
+
+    def timed(self, function):
+        """
+        Returns a wrapper of the given hash function that records each call
+        and its duration. The wrapper's __wrapped__ attribute is function.
+        """
+        clock = time.perf_counter
+
+        def timed_function(key):
+            start = clock()
+            hash = function(key)
+            self.hash_seconds += clock() - start
+            self.hash_calls += 1
+            return hash
+
+        timed_function.__wrapped__ = function
+        return timed_function
+
+    def snapshot(self) -> dict:
+        """
+        Returns the counters as a dict of plain numbers, with the probe
+        histogram as a dict from number of probes to number of lookups.
+        """
+        return {
+            'lookups': self.lookups,
+            'mean_probes': self.probes / self.lookups if self.lookups else 0.0,
+            'max_probes': max(self.probe_histogram, default=0),
+            'probe_histogram': dict(sorted(self.probe_histogram.items())),
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+            'max_resize_seconds': self.max_resize_seconds,
+            'hash_calls': self.hash_calls,
+            'hash_seconds': self.hash_seconds,
+        }
+
+
+# ------------------- Views (SC & OA)  ------------------- #
+
+class MapView:
+    """
+    A live view of a HashMap's keys, values or (key, value) items, as
+    returned by its keys(), values() and items() methods. Nothing is
+    copied: iterating a view streams the entries straight from the map's
+    buckets, in bucket order. As with dict, updating values while
+    iterating is fine, but if the map gains or loses keys, or is resized,
+    the iteration stops with a RuntimeError.
+    """
+
+    __slots__ = ('_map', '_part')
+
+    def __init__(self, hash_map, part: str) -> None:
+        """
+        Initialize a view of the given map's 'keys', 'values' or 'items'.
+        """
+        self._map = hash_map
+        self._part = part
+
+    def __iter__(self):
+        """Return an iterator over the map's keys, values or items."""
+        items = self._map._iter_items()
+        if self._part == 'items':
+            return items
+        return map(itemgetter(self._part == 'values'), items)
+
+    def __len__(self) -> int:
+        """Return the number of entries in the map."""
+        return self._map.get_size()
+
+    def __contains__(self, item) -> bool:
+        """
+        Return whether the map holds the given key or (key, value) item.
+        Values have no index, so looking for one scans the map.
+        """
+        if self._part == 'keys':
+            return self._map.contains_key(item)
+        if self._part == 'items':
+            key, value = item
+            return self._map.contains_key(key) and self._map.get(key) == value
+        return item in iter(self)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return self._part + str(list(self))
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +573,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """Initialize node given a key, value and (optionally) the key's hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -168,20 +642,22 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If the key's hash is given, nodes with a different cached hash
+        are skipped without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,11 +668,22 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If the key's hash is given, nodes with a different cached hash
+        are skipped without comparing keys.
+        """
         node = self._head
+        if hash is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
+
         while node:
-            if node.key == key:
+            if node.hash == hash and node.key == key:
                 return node
             node = node.next
         return node
@@ -206,14 +693,106 @@ class LinkedList:
         return self._size
 
 
+class SortedChain:
+    """
+    Class implementing a hash chain as an array of nodes sorted by
+    (hash, key), so that long chains can be searched by bisection.
+    Supported methods are: insert, remove, contains, length, iterator
+    Unlike LinkedList, every method requires the key's hash.
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """
+        Initialize new chain, optionally holding the given nodes (such as
+        a LinkedList being converted). Keys that cannot be ordered against
+        each other fall back to a linear scan among nodes of equal hash.
+        """
+        nodes = list(nodes)
+        for node in nodes:
+            node.next = None
+        self._ordered = True
+        try:
+            nodes.sort(key=lambda node: (node.hash, node.key))
+        except TypeError:
+            self._ordered = False
+            nodes.sort(key=lambda node: node.hash)
+
+        self._nodes = nodes
+        self._hashes = [node.hash for node in nodes]
+        self._keys = [node.key for node in nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SC [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in sorted order."""
+        return iter(self._nodes)
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Insert new node at its sorted position."""
+        index = self._find(key, hash)[0]
+        self._nodes.insert(index, SLNode(key, value, None, hash))
+        self._hashes.insert(index, hash)
+        self._keys.insert(index, key)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        index, found = self._find(key, hash)
+        if found:
+            del self._nodes[index]
+            del self._hashes[index]
+            del self._keys[index]
+        return found
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index, found = self._find(key, hash)
+        return self._nodes[index] if found else None
+
+    def length(self) -> int:
+        """Return the length of the chain."""
+        return len(self._nodes)
+
+    def _find(self, key: str, hash: int) -> tuple:
+        """
+        Return (index, found): the index of the node with matching key, or
+        the index at which such a node belongs, and whether it was found.
+        """
+        low = bisect_left(self._hashes, hash)
+        high = bisect_right(self._hashes, hash, low)
+        keys = self._keys
+
+        if self._ordered:
+            try:
+                index = bisect_left(keys, key, low, high)
+                return index, index < high and keys[index] == key
+            except TypeError:
+                self._ordered = False
+
+        for index in range(low, high):
+            if keys[index] == key:
+                return index, True
+        return high, False
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map, optionally caching
+        the key's hash so it never needs to be recomputed.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
         self.is_tombstone = False
 
     def __str__(self) -> str:
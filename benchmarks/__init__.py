@@ -0,0 +1,5 @@
+"""
+Benchmarks for the HashMap implementations. Run any module from the
+repository root, e.g. python -m benchmarks.hash_functions, or run
+python -m benchmarks.suite --help for the full workload suite.
+"""
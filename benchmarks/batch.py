@@ -0,0 +1,81 @@
+# Course: CS261 - Data Structures
+# Description: Compares the batch operations (put_many, get_many,
+#              contains_many, remove_many) against the equivalent loop of
+#              single calls, on both HashMaps.
+
+
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, SeededHash
+
+
+def loop_seconds(module, pairs: list) -> dict:
+    """Returns the time taken by each operation when called once per key."""
+    keys = [pair[0] for pair in pairs]
+    map = module.HashMap(11, SeededHash())
+    times = {}
+
+    start = time.perf_counter()
+    for key, value in pairs:
+        map.put(key, value)
+    times["put"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        map.get(key)
+    times["get"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        map.contains_key(key)
+    times["contains"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        map.remove(key)
+    times["remove"] = time.perf_counter() - start
+    return times
+
+
+def batch_seconds(module, pairs: list) -> dict:
+    """Returns the time taken by each operation when called on the whole batch."""
+    pairs = DynamicArray(pairs)
+    keys = DynamicArray([pairs[i][0] for i in range(pairs.length())])
+    map = module.HashMap(11, SeededHash())
+    times = {}
+
+    start = time.perf_counter()
+    map.put_many(pairs)
+    times["put"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    map.get_many(keys)
+    times["get"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    map.contains_many(keys)
+    times["contains"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    map.remove_many(keys)
+    times["remove"] = time.perf_counter() - start
+    return times
+
+
+def main(count: int = 200000) -> None:
+    """Prints loop and batch timings, and the speedup, for each operation."""
+    pairs = [("key" + str(i), i) for i in range(count)]
+    print(f"{'map':<13}{'operation':<10}{'loop sec':>10}{'batch sec':>11}{'speedup':>9}")
+    for module in (hash_map_oa, hash_map_sc):
+        loop = loop_seconds(module, pairs)
+        batch = batch_seconds(module, pairs)
+        for operation in loop:
+            print(f"{module.__name__:<13}{operation:<10}{loop[operation]:>10.3f}"
+                  f"{batch[operation]:>11.3f}"
+                  f"{loop[operation] / batch[operation]:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
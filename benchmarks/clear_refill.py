@@ -0,0 +1,81 @@
+# Course: CS261 - Data Structures
+# Description: Times cycles of clearing a reused scratch map and refilling
+#              it with a small batch of keys, as a per-request cache would,
+#              against building a new map of the same capacity for each
+#              cycle, for both HashMaps and a range of capacities.
+
+
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import mix_hash
+
+MAPS = (
+    ("oa.HashMap", hash_map_oa.HashMap),
+    ("oa.CompactHashMap", hash_map_oa.CompactHashMap),
+    ("sc.HashMap", hash_map_sc.HashMap),
+)
+
+
+def refill(map, keys: list) -> None:
+    """Puts each key into the map, with its index as the value."""
+    put = map.put
+    for value, key in enumerate(keys):
+        put(key, value)
+
+
+def reuse_seconds(factory, capacity: int, keys: list, cycles: int) -> tuple:
+    """
+    Returns the mean seconds taken by clear() on a map holding keys, and
+    by a whole cycle of clear() and refill, over the given number of
+    cycles on one map.
+    """
+    map = factory(capacity, mix_hash)
+    refill(map, keys)
+    clearing = 0.0
+    start = time.perf_counter()
+    for _ in range(cycles):
+        before = time.perf_counter()
+        map.clear()
+        clearing += time.perf_counter() - before
+        refill(map, keys)
+    total = time.perf_counter() - start
+    return clearing / cycles, total / cycles
+
+
+def fresh_seconds(factory, capacity: int, keys: list, cycles: int) -> float:
+    """
+    Returns the mean seconds taken to build a new map of the given
+    capacity and fill it with keys.
+    """
+    start = time.perf_counter()
+    for _ in range(cycles):
+        map = factory(capacity, mix_hash)
+        refill(map, keys)
+    return (time.perf_counter() - start) / cycles
+
+
+def main(batch: int = 100, capacities=(1000, 100000, 1000000)) -> None:
+    """
+    Prints, for each map and capacity, the time of clear() alone, of a
+    clear-and-refill cycle, and of a new-map-and-fill cycle, all in
+    microseconds, and how many times faster reuse is.
+    """
+    keys = ['key' + str(i) for i in range(batch)]
+    print(f"{batch} keys per cycle\n")
+    print(f"{'map':<19}{'capacity':>9}{'clear us':>11}{'reuse us':>11}"
+          f"{'new us':>11}{'speedup':>9}")
+    for name, factory in MAPS:
+        for capacity in capacities:
+            cycles = max(5, 2000000 // capacity)
+            clearing, reuse = reuse_seconds(factory, capacity, keys, cycles)
+            fresh = fresh_seconds(factory, capacity, keys,
+                                  max(3, cycles // 10))
+            print(f"{name:<19}{capacity:>9}{clearing * 1e6:>11.1f}"
+                  f"{reuse * 1e6:>11.1f}{fresh * 1e6:>11.1f}"
+                  f"{fresh / reuse:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
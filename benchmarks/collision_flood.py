@@ -0,0 +1,68 @@
+# Course: CS261 - Data Structures
+# Description: Generates collision floods (many keys sharing one hash value)
+#              against the sample hash functions, and measures per-operation
+#              latency of both HashMaps as the flood grows. With a KeyedHash
+#              the same keys are spread evenly, so latency stays flat.
+
+
+import itertools
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import KeyedHash, hash_function_1, hash_function_2
+
+
+SIZES = (250, 500, 1000, 2000)
+ALPHABET = 'abcdefghijklmnop'
+
+
+def flood(function, count: int, length: int = 5) -> list:
+    """
+    Returns count distinct keys that all share one hash value under the
+    given function, found by enumerating strings of the given length.
+    The target is the hash of a string in the middle of the alphabet, near
+    the most common value.
+    """
+    target = function(ALPHABET[len(ALPHABET) // 2] * length)
+    keys = []
+    for letters in itertools.product(ALPHABET, repeat=length):
+        key = ''.join(letters)
+        if function(key) == target:
+            keys.append(key)
+            if len(keys) == count:
+                return keys
+    raise ValueError("not enough colliding keys; increase length")
+
+
+def op_microseconds(module, function, keys: list) -> float:
+    """Returns the mean time of a put and get of each key, in microseconds."""
+    map = module.HashMap(11, function)
+    start = time.perf_counter()
+    for key in keys:
+        map.put(key, key)
+    for key in keys:
+        map.get(key)
+    return (time.perf_counter() - start) / (2 * len(keys)) * 1e6
+
+
+def main(sizes: tuple = SIZES) -> None:
+    """
+    Prints one row per attacked function and map, with the microseconds
+    per operation at each flood size.
+    """
+    print(f"{'flood against':<17}{'hashed with':<17}{'map':<6}"
+          + ''.join(f"{size:>10}" for size in sizes))
+    for name, attacked in (("hash_function_1", hash_function_1),
+                           ("hash_function_2", hash_function_2)):
+        keys = flood(attacked, max(sizes))
+        for label, function in ((name, attacked), ("KeyedHash", KeyedHash())):
+            for module, map_name in ((hash_map_oa, "oa"), (hash_map_sc, "sc")):
+                row = f"{name:<17}{label:<17}{map_name:<6}"
+                for size in sizes:
+                    row += f"{op_microseconds(module, function, keys[:size]):>10.2f}"
+                print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# Course: CS261 - Data Structures
+# Description: Multi-threaded stress test and throughput benchmark for the
+#              striped-lock concurrent HashMap, against a separate chaining
+#              HashMap behind one global lock. On free-threaded CPython
+#              builds (3.13t and later, with the GIL disabled) the threads
+#              really run in parallel.
+
+
+import random
+import sys
+import threading
+import time
+
+import hash_map_cc
+import hash_map_sc
+from a6_include import SeededHash
+
+
+THREADS = (1, 2, 4, 8, 16)
+
+
+def gil_enabled() -> bool:
+    """Returns False only on a free-threaded build running without the GIL."""
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+class LockedHashMap:
+    """Separate chaining HashMap made thread-safe by one global lock."""
+
+    def __init__(self, capacity: int, function) -> None:
+        """Wraps a new hash_map_sc.HashMap."""
+        self._map = hash_map_sc.HashMap(capacity, function)
+        self._lock = threading.Lock()
+
+    def put(self, key, value) -> None:
+        """Stores a key-value pair under the lock."""
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key) -> object:
+        """Returns the value for key under the lock."""
+        with self._lock:
+            return self._map.get(key)
+
+
+def run_threads(count: int, target, *args) -> float:
+    """
+    Runs target(index, *args) in count threads, started together, and
+    returns the seconds until all have finished. Re-raises the first
+    exception any of them raised.
+    """
+    errors = []
+    barrier = threading.Barrier(count + 1)
+
+    def body(index: int) -> None:
+        barrier.wait()
+        try:
+            target(index, *args)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=body, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def stress(threads: int = 8, ops: int = 20000, shared: int = 64) -> None:
+    """
+    Has every thread put and remove its own keys and overwrite a set of
+    shared keys, starting from a tiny table so that resizes race with
+    everything else, while reading keys of all kinds. Each value records
+    its key, so a read that ever returns another key's value fails at once.
+    Afterwards the map must hold exactly each thread's surviving keys plus
+    the shared keys. With the GIL, threads are switched as often as
+    possible meanwhile, to interleave them as finely as it allows.
+    """
+    map = hash_map_cc.HashMap(1, SeededHash(), stripes=8)
+    survivors = [None] * threads
+
+    def work(index: int) -> None:
+        rng = random.Random(index)
+        mine = {}
+        for op in range(ops):
+            choice = rng.random()
+            if choice < 0.4:
+                key = (index, rng.randrange(ops // 4))
+                map.put(key, (key, op))
+                mine[key] = (key, op)
+            elif choice < 0.55:
+                key = (index, rng.randrange(ops // 4))
+                map.remove(key)
+                mine.pop(key, None)
+            elif choice < 0.7:
+                key = ('shared', rng.randrange(shared))
+                map.put(key, (key, op))
+            else:
+                key = (rng.randrange(threads), rng.randrange(ops // 4))
+                if rng.random() < 0.3:
+                    key = ('shared', rng.randrange(shared))
+                value = map.get(key)
+                assert value is None or value[0] == key, (key, value)
+                if key[0] == index:
+                    assert value == mine.get(key), (key, value)
+        survivors[index] = mine
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        run_threads(threads, work)
+    finally:
+        sys.setswitchinterval(interval)
+
+    expected = {}
+    for mine in survivors:
+        expected.update(mine)
+    shared_keys = [key for key in map.get_keys().as_list()
+                   if key[0] == 'shared']
+    assert map.get_size() == len(expected) + len(shared_keys)
+    for key, value in expected.items():
+        assert map.get(key) == value, key
+    print(f"stress test passed: {threads} threads, {ops} operations each, "
+          f"{map.get_size()} keys, capacity {map.get_capacity()}")
+
+
+def throughput(map, threads: int, ops: int, keys: int) -> float:
+    """
+    Returns operations per second with the given number of threads each
+    doing ops operations (80% get, 20% put) over a shared key range.
+    """
+    def work(index: int) -> None:
+        rng = random.Random(index)
+        for _ in range(ops):
+            key = rng.randrange(keys)
+            if rng.random() < 0.2:
+                map.put(key, index)
+            else:
+                map.get(key)
+
+    return threads * ops / run_threads(threads, work)
+
+
+def main(ops: int = 20000, keys: int = 10000) -> None:
+    """Runs the stress test, then prints operations per second by threads."""
+    print(f"GIL enabled: {gil_enabled()}")
+    stress()
+    print(f"{'threads':>7}{'striped ops/s':>16}{'global lock ops/s':>20}")
+    for threads in THREADS:
+        striped = hash_map_cc.HashMap(keys, SeededHash())
+        locked = LockedHashMap(keys, SeededHash())
+        for i in range(keys):
+            striped.put(i, i)
+            locked.put(i, i)
+        print(f"{threads:>7}{throughput(striped, threads, ops, keys):>16.0f}"
+              f"{throughput(locked, threads, ops, keys):>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
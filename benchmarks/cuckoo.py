@@ -0,0 +1,84 @@
+# Course: CS261 - Data Structures
+# Description: Compares the cuckoo hashing map against the open addressing and
+#              separate chaining maps: time per operation, and the mean and
+#              worst-case number of slots (or chain nodes) a lookup examines.
+
+
+import time
+
+import hash_map_ch
+import hash_map_oa
+import hash_map_sc
+from a6_include import mix_hash
+
+
+def oa_lookup_costs(map, keys: list) -> list:
+    """Returns the number of slots examined to find each key."""
+    return [map._find_slot(key, mix_hash(key))[1] for key in keys]
+
+
+def sc_lookup_costs(map, keys: list) -> list:
+    """Returns the length of the chain searched for each key."""
+    buckets = map._buckets
+    return [buckets[mix_hash(key) % map.get_capacity()].length()
+            for key in keys]
+
+
+def ch_lookup_costs(map, keys: list) -> list:
+    """
+    Returns the number of slots examined to find each key: the candidate
+    slots in each table up to the one holding it, then the stash.
+    """
+    costs = []
+    for key in keys:
+        table, index = map._find(key)
+        if table >= 0:
+            costs.append(table + 1)
+        else:
+            costs.append(map._tables + index + 1)
+    return costs
+
+
+def run(name: str, map, costs, keys: list, misses: list) -> None:
+    """Fills the map, times hits and misses, and prints a row."""
+    start = time.perf_counter()
+    for key in keys:
+        map.put(key, key)
+    put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        map.get(key)
+    hit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in misses:
+        map.get(key)
+    miss_seconds = time.perf_counter() - start
+
+    lengths = costs(map, keys)
+    print(f"{name:<16}{put_seconds / len(keys) * 1e6:>8.2f}"
+          f"{hit_seconds / len(keys) * 1e6:>8.2f}"
+          f"{miss_seconds / len(misses) * 1e6:>10.2f}"
+          f"{sum(lengths) / len(lengths):>9.2f}{max(lengths):>6}"
+          f"{map.get_capacity():>10}")
+
+
+def main(count: int = 20000) -> None:
+    """Prints one row per map."""
+    keys = ["key" + str(i) for i in range(count)]
+    misses = ["miss" + str(i) for i in range(count)]
+    print(f"{'map':<16}{'put us':>8}{'hit us':>8}{'miss us':>10}"
+          f"{'mean':>9}{'max':>6}{'capacity':>10}")
+    run("open addressing", hash_map_oa.HashMap(11, mix_hash), oa_lookup_costs,
+        keys, misses)
+    run("chaining", hash_map_sc.HashMap(11, mix_hash), sc_lookup_costs,
+        keys, misses)
+    run("cuckoo (2)", hash_map_ch.HashMap(11, mix_hash), ch_lookup_costs,
+        keys, misses)
+    run("cuckoo (3)", hash_map_ch.HashMap(11, mix_hash, tables=3),
+        ch_lookup_costs, keys, misses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Course: CS261 - Data Structures
+# Description: Compares the collision rates and per-call cost of the hash
+#              functions in a6_include, and their effect on both HashMaps.
+
+
+import itertools
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import (SeededHash, fnv1a_hash, hash_function_1,
+                        hash_function_2, mix_hash, next_prime)
+
+
+HASH_FUNCTIONS = (
+    ("hash_function_1", hash_function_1),
+    ("hash_function_2", hash_function_2),
+    ("fnv1a_hash", fnv1a_hash),
+    ("mix_hash", mix_hash),
+    ("SeededHash", SeededHash()),
+)
+
+
+def key_sets(count: int) -> dict:
+    """
+    Returns named lists of keys: sequential strings, anagrams of one
+    another, strided ints and bytes.
+    """
+    anagrams = itertools.permutations("abcdefghi")
+    return {
+        "words": ["str" + str(i) for i in range(count)],
+        "anagrams": ["".join(p) for p in itertools.islice(anagrams, count)],
+        "ints": [i * 64 for i in range(count)],
+        "bytes": [b"key:%d" % i for i in range(count)],
+    }
+
+
+def collision_rate(function, keys: list) -> float:
+    """
+    Returns the fraction of keys that land in an already occupied bucket
+    of a table with a (prime) capacity equal to the number of keys.
+    A uniform hash scores about 0.37 here.
+    """
+    capacity = next_prime(len(keys))
+    used = set()
+    for key in keys:
+        used.add(function(key) % capacity)
+    return 1 - len(used) / len(keys)
+
+
+def ns_per_call(function, keys: list) -> float:
+    """Returns the mean time of a single hash function call, in nanoseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def map_seconds(module, function, keys: list) -> float:
+    """
+    Returns the time taken to put and then get every key in a HashMap
+    from the given module.
+    """
+    start = time.perf_counter()
+    map = module.HashMap(next_prime(len(keys) * 2), function)
+    for key in keys:
+        map.put(key, key)
+    for key in keys:
+        map.get(key)
+    return time.perf_counter() - start
+
+
+def main(count: int = 5000) -> None:
+    """Prints one row per key set and hash function."""
+    print(f"{'keys':<10}{'function':<17}{'collisions':>11}{'ns/call':>10}"
+          f"{'oa sec':>9}{'sc sec':>9}")
+    for set_name, keys in key_sets(count).items():
+        for name, function in HASH_FUNCTIONS:
+            try:
+                function(keys[0])
+            except TypeError:
+                # The sample functions only accept str keys
+                continue
+            print(f"{set_name:<10}{name:<17}"
+                  f"{collision_rate(function, keys):>11.3f}"
+                  f"{ns_per_call(function, keys):>10.0f}"
+                  f"{map_seconds(hash_map_oa, function, keys):>9.3f}"
+                  f"{map_seconds(hash_map_sc, function, keys):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Course: CS261 - Data Structures
+# Description: Compares the memory and accuracy of the approximate counters
+#              in sketch.py against exact counting with find_mode's
+#              FrequencyCounter, on a skewed stream with many distinct
+#              tokens, and checks that sketches of a split stream merge to
+#              the same answer.
+
+
+import random
+import time
+import tracemalloc
+
+from a6_include import mix_hash
+from hash_map_sc import FrequencyCounter
+from sketch import CountMinSketch, SpaceSaving
+
+
+def skewed_stream(count: int, vocabulary: int = 1000000,
+                  seed: int = 261) -> list:
+    """
+    Returns count tokens drawn from vocabulary distinct tokens with a Zipf
+    distribution, where the token of rank r has weight 1 / r: a few tokens
+    are very common, and most of those drawn appear once or twice.
+    """
+    rng = random.Random(seed)
+    weights = []
+    total = 0.0
+    for rank in range(1, vocabulary + 1):
+        total += 1 / rank
+        weights.append(total)
+    ranks = rng.choices(range(vocabulary), cum_weights=weights, k=count)
+    return ['tok' + str(rank) for rank in ranks]
+
+
+def measure(build, tokens: list) -> tuple:
+    """
+    Returns the counter made by build() after it has counted tokens, the
+    seconds taken, and the memory it holds in MB, measured in a second
+    pass under tracemalloc so that tracing does not skew the timing.
+    """
+    start = time.perf_counter()
+    counter = build()
+    counter.update(tokens)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    traced = build()
+    traced.update(tokens)
+    memory = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del traced
+    return counter, seconds, memory
+
+
+def main(count: int = 200000, top: int = 20) -> None:
+    """
+    Prints one row per counter with its time, memory, whether it found the
+    exact mode and its count, how many of the true top keys it reports
+    (summaries) or its worst overestimate of them (sketches).
+    """
+    tokens = skewed_stream(count)
+    exact, seconds, memory = measure(
+        lambda: FrequencyCounter(function=mix_hash), tokens)
+    modes, mode_count = exact.get_mode()
+    true_top = exact.most_common(top).as_list()
+    print(f"{count} tokens, {exact.get_size()} distinct, "
+          f"mode {modes.as_list()} x {mode_count}\n")
+
+    print(f"{'counter':<26}{'time s':>8}{'memory MB':>11}{'mode':>6}"
+          f"{'mode count':>12}{'top-' + str(top):>9}{'max over':>10}"
+          f"{'bound':>9}")
+    print(f"{'exact FrequencyCounter':<26}{seconds:>8.2f}{memory:>11.2f}"
+          f"{'yes':>6}{mode_count:>12}{top:>9}{0:>10}{0:>9}")
+
+    for epsilon in (0.001, 0.0001):
+        summary, seconds, memory = measure(
+            lambda: SpaceSaving(epsilon, mix_hash), tokens)
+        found, found_count = summary.get_mode()
+        reported = {key for key, _ in summary.most_common(top).as_list()}
+        hits = sum(key in reported for key, _ in true_top)
+        over = max(summary.estimate(key) - true for key, true in true_top)
+        same = 'yes' if found.as_list() == modes.as_list() else 'no'
+        print(f"{'SpaceSaving e=' + str(epsilon):<26}{seconds:>8.2f}"
+              f"{memory:>11.2f}{same:>6}{found_count:>12}{hits:>9}"
+              f"{over:>10}{summary.error_bound():>9.0f}")
+
+    for epsilon in (0.001, 0.0001):
+        sketch, seconds, memory = measure(
+            lambda: CountMinSketch(epsilon, 0.01, seed=1), tokens)
+        over = max(sketch.estimate(key) - true for key, true in true_top)
+        print(f"{'CountMinSketch e=' + str(epsilon):<26}{seconds:>8.2f}"
+              f"{memory:>11.2f}{'-':>6}{sketch.estimate(modes[0]):>12}"
+              f"{'-':>9}{over:>10}{sketch.error_bound():>9.0f}")
+
+    # Count four slices of the stream separately, as parallel workers would,
+    # then merge them
+    sketches = [CountMinSketch(0.001, 0.01, seed=1) for _ in range(4)]
+    summaries = [SpaceSaving(0.001, mix_hash) for _ in range(4)]
+    for part in range(4):
+        sketches[part].update(tokens[part::4])
+        summaries[part].update(tokens[part::4])
+    whole = CountMinSketch(0.001, 0.01, seed=1)
+    whole.update(tokens)
+    for part in range(1, 4):
+        sketches[0].merge(sketches[part])
+        summaries[0].merge(summaries[part])
+    reported = {key for key, _ in summaries[0].most_common(top).as_list()}
+    print(f"\nmerged 4 CountMinSketch slices equal one pass: "
+          f"{sketches[0]._counts == whole._counts}")
+    print(f"merged 4 SpaceSaving slices: mode {summaries[0].get_mode()[0]}, "
+          f"top-{top} found {sum(key in reported for key, _ in true_top)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Course: CS261 - Data Structures
+# Description: Compares per-operation latency of the stop-the-world and
+#              incremental resizing HashMaps while a map grows from empty,
+#              which is where resize pauses show up.
+
+
+import gc
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import SeededHash
+
+
+def put_latencies(map, count: int) -> list:
+    """
+    Returns the time taken by each of count puts, in microseconds. The
+    garbage collector is paused meanwhile, so that its own pauses do not
+    mask those of resizing.
+    """
+    latencies = []
+    clock = time.perf_counter
+    gc.disable()
+    try:
+        for i in range(count):
+            start = clock()
+            map.put(i, i)
+            latencies.append((clock() - start) * 1e6)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def main(count: int = 200000) -> None:
+    """Prints one row per map with its mean, p99, p99.9 and worst put."""
+    print(f"{'map':<26}{'mean us':>9}{'p99 us':>9}{'p99.9 us':>10}"
+          f"{'max us':>11}{'total s':>9}")
+    maps = (
+        ("oa HashMap", hash_map_oa.HashMap),
+        ("oa IncrementalHashMap", hash_map_oa.IncrementalHashMap),
+        ("sc HashMap", hash_map_sc.HashMap),
+        ("sc IncrementalHashMap", hash_map_sc.IncrementalHashMap),
+    )
+    for name, cls in maps:
+        latencies = put_latencies(cls(11, SeededHash()), count)
+        total = sum(latencies)
+        latencies.sort()
+        print(f"{name:<26}{total / count:>9.2f}"
+              f"{latencies[int(count * 0.99)]:>9.2f}"
+              f"{latencies[int(count * 0.999)]:>10.2f}"
+              f"{latencies[-1]:>11.0f}{total / 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
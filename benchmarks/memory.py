@@ -0,0 +1,46 @@
+# Course: CS261 - Data Structures
+# Description: Measures the memory each HashMap implementation uses per
+#              entry, not counting the key and value objects themselves.
+
+
+import tracemalloc
+
+import hash_map_oa
+import hash_map_od
+import hash_map_sc
+from a6_include import SeededHash
+
+
+MAPS = (
+    ("hash_map_oa.HashMap", hash_map_oa.HashMap),
+    ("hash_map_oa.CompactHashMap", hash_map_oa.CompactHashMap),
+    ("hash_map_od.HashMap", hash_map_od.HashMap),
+    ("hash_map_sc.HashMap", hash_map_sc.HashMap),
+)
+
+
+def bytes_per_entry(map_class, pairs: list) -> float:
+    """
+    Returns the memory allocated while building a map from the given
+    pairs, divided by the number of pairs. The pairs are created before
+    tracing starts, so only the map's own structures are counted.
+    """
+    tracemalloc.start()
+    map = map_class(11, SeededHash())
+    for key, value in pairs:
+        map.put(key, value)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(pairs)
+
+
+def main(count: int = 200000) -> None:
+    """Prints the bytes per entry of each map."""
+    pairs = [("key" + str(i), i) for i in range(count)]
+    print(f"{'map':<30}{'bytes/entry':>12}")
+    for name, map_class in MAPS:
+        print(f"{name:<30}{bytes_per_entry(map_class, pairs):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Course: CS261 - Data Structures
+# Description: Compares starting up with a table rebuilt by replaying put()
+#              calls against opening the same table as a memory-mapped file,
+#              and the lookup speed of each.
+
+
+import os
+import tempfile
+import time
+
+import hash_map_mm
+import hash_map_oa
+from a6_include import mix_hash
+
+
+def seconds(function, *args) -> tuple:
+    """Returns the result of calling function, and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def rebuild(pairs: list):
+    """Returns a HashMap filled by one put() per pair."""
+    map = hash_map_oa.HashMap(11, mix_hash)
+    for key, value in pairs:
+        map.put(key, value)
+    return map
+
+
+def lookup_us(map, keys: list) -> float:
+    """Returns the mean time of a get(), in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        map.get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main(count: int = 200000) -> None:
+    """Prints startup time and lookup speed for both approaches."""
+    pairs = [("key" + str(i), ("value", i)) for i in range(count)]
+    keys = [key for key, value in pairs]
+    path = os.path.join(tempfile.mkdtemp(), 'table.bin')
+
+    map, rebuild_seconds = seconds(rebuild, pairs)
+    write_seconds = seconds(hash_map_mm.write_table, path, map)[1]
+    mapped, open_seconds = seconds(hash_map_mm.HashMap, path)
+
+    print(f"{'':<22}{'startup s':>12}{'get us':>9}")
+    print(f"{'replay put()':<22}{rebuild_seconds:>12.4f}"
+          f"{lookup_us(map, keys):>9.2f}")
+    print(f"{'open mapped file':<22}{open_seconds:>12.6f}"
+          f"{lookup_us(mapped, keys):>9.2f}")
+    print(f"(writing the {os.path.getsize(path) / 1e6:.1f} MB file once took "
+          f"{write_seconds:.2f} s)")
+    mapped.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
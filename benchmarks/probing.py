@@ -0,0 +1,70 @@
+# Course: CS261 - Data Structures
+# Description: Compares the open addressing probe strategies: time per
+#              operation, and mean and longest probe sequence lengths.
+
+
+import time
+
+import hash_map_oa
+from a6_include import SeededHash, hash_function_2
+
+
+STRATEGIES = ('linear', 'quadratic', 'triangular', 'double')
+
+
+def probe_lengths(map, keys: list) -> list:
+    """Returns the number of slots examined to find each of the given keys."""
+    hash_function = map._hash_function
+    return [map._find_slot(key, hash_function(key))[1] for key in keys]
+
+
+def run(probing: str, function, keys: list, misses: list) -> dict:
+    """
+    Fills a map using the given strategy, then times hits and misses and
+    collects probe lengths.
+    """
+    map = hash_map_oa.HashMap(11, function, probing=probing)
+    start = time.perf_counter()
+    for key in keys:
+        map.put(key, key)
+    put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        map.get(key)
+    hit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in misses:
+        map.get(key)
+    miss_seconds = time.perf_counter() - start
+
+    lengths = probe_lengths(map, keys)
+    return {
+        "put_us": put_seconds / len(keys) * 1e6,
+        "hit_us": hit_seconds / len(keys) * 1e6,
+        "miss_us": miss_seconds / len(misses) * 1e6,
+        "mean_probes": sum(lengths) / len(lengths),
+        "max_probes": max(lengths),
+        "capacity": map.get_capacity(),
+    }
+
+
+def main(count: int = 10000) -> None:
+    """Prints one row per hash function and probe strategy."""
+    keys = ["key" + str(i) for i in range(count)]
+    misses = ["miss" + str(i) for i in range(count)]
+    print(f"{'function':<17}{'probing':<12}{'put us':>8}{'hit us':>8}"
+          f"{'miss us':>10}{'mean':>9}{'max':>6}{'capacity':>10}")
+    for name, function in (("hash_function_2", hash_function_2),
+                           ("SeededHash", SeededHash())):
+        for probing in STRATEGIES:
+            result = run(probing, function, keys, misses)
+            print(f"{name:<17}{probing:<12}{result['put_us']:>8.2f}"
+                  f"{result['hit_us']:>8.2f}{result['miss_us']:>10.2f}"
+                  f"{result['mean_probes']:>9.2f}{result['max_probes']:>6}"
+                  f"{result['capacity']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Course: CS261 - Data Structures
+# Description: Compares probe sequence lengths of the Robin Hood map against
+#              the quadratic (and linear) probing open addressing map, for
+#              hits and misses at load factors from 0.5 to 0.9.
+
+
+import hash_map_oa
+import hash_map_rh
+from a6_include import SeededHash
+
+
+LOADS = (0.5, 0.6, 0.7, 0.8, 0.9)
+NAMES = ("robin hood", "quadratic", "linear")
+
+
+def percentile(values: list, fraction: float) -> int:
+    """Returns the value at the given fraction of the sorted values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def fill_oa(probing: str, function, capacity: int, keys: list):
+    """
+    Returns an open addressing map holding the given keys. The map only grows
+    if an insert finds no reachable open slot, so its load may end up lower
+    than requested.
+    """
+    map = hash_map_oa.HashMap(capacity, function, max_load=1.0,
+                              probing=probing)
+    for key in keys:
+        map.put(key, key)
+    return map
+
+
+def oa_lengths(map, keys: list) -> list:
+    """Returns the number of slots examined to find (or miss) each key."""
+    hash_function = map._hash_function
+    return [map._find_slot(key, hash_function(key))[1] for key in keys]
+
+
+def fill_rh(function, capacity: int, keys: list):
+    """Returns a Robin Hood map of the given capacity holding the keys."""
+    map = hash_map_rh.HashMap(capacity, function, max_load=1.0)
+    for key in keys:
+        map.put(key, key)
+    return map
+
+
+def rh_lengths(map, keys: list) -> list:
+    """Returns the number of slots examined to find (or miss) each key."""
+    return [map._probe_length(key) for key in keys]
+
+
+def collect(load: float, capacity: int, seeds: int) -> dict:
+    """
+    Fills each map to the given load once per seed, and returns its pooled
+    hit and miss probe lengths and achieved load.
+    """
+    count = int(capacity * load)
+    keys = ["key" + str(i) for i in range(count)]
+    misses = ["miss" + str(i) for i in range(count)]
+    results = {name: ([], [], []) for name in NAMES}
+    for _ in range(seeds):
+        function = SeededHash()
+        maps = (
+            ("robin hood", fill_rh(function, capacity, keys), rh_lengths),
+            ("quadratic", fill_oa('quadratic', function, capacity, keys),
+             oa_lengths),
+            ("linear", fill_oa('linear', function, capacity, keys),
+             oa_lengths),
+        )
+        for name, map, lengths in maps:
+            hits, missed, loads = results[name]
+            hits.extend(lengths(map, keys))
+            missed.extend(lengths(map, misses))
+            loads.append(map.table_load())
+    return results
+
+
+def main(capacity: int = 1 << 14, seeds: int = 3) -> None:
+    """Prints one row per load factor and map."""
+    print(f"{'load':<6}{'map':<12}{'actual':>8}{'hit mean':>10}{'hit p99':>9}"
+          f"{'miss mean':>11}{'miss p99':>10}")
+    for load in LOADS:
+        results = collect(load, capacity, seeds)
+        for name in NAMES:
+            hits, missed, loads = results[name]
+            print(f"{load:<6}{name:<12}{sum(loads) / len(loads):>8.2f}"
+                  f"{sum(hits) / len(hits):>10.2f}{percentile(hits, 0.99):>9}"
+                  f"{sum(missed) / len(missed):>11.2f}"
+                  f"{percentile(missed, 0.99):>10}")
+
+
+if __name__ == "__main__":
+    main()
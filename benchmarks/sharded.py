@@ -0,0 +1,56 @@
+# Course: CS261 - Data Structures
+# Description: Measures put_many and get_many throughput of the sharded
+#              multi-process HashMap as the number of shards grows, against
+#              a single in-process HashMap. Scaling is bounded by the number
+#              of CPU cores.
+
+
+import multiprocessing
+import time
+
+import hash_map_sc
+import hash_map_sh
+from a6_include import DynamicArray, SeededHash
+
+
+SHARDS = (1, 2, 4, 8)
+
+
+def run(map, pairs: list, batch: int) -> tuple:
+    """
+    Returns put_many and get_many throughput, in operations per second,
+    for the pairs sent in batches of the given size.
+    """
+    batches = [DynamicArray(pairs[i:i + batch])
+               for i in range(0, len(pairs), batch)]
+    key_batches = [DynamicArray([key for key, value in pairs[i:i + batch]])
+                   for i in range(0, len(pairs), batch)]
+
+    start = time.perf_counter()
+    for pairs_batch in batches:
+        map.put_many(pairs_batch)
+    put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for keys_batch in key_batches:
+        map.get_many(keys_batch)
+    get_seconds = time.perf_counter() - start
+    return len(pairs) / put_seconds, len(pairs) / get_seconds
+
+
+def main(count: int = 200000, batch: int = 10000) -> None:
+    """Prints one row for the in-process map and one per shard count."""
+    pairs = [("key" + str(i), i) for i in range(count)]
+    print(f"CPU cores: {multiprocessing.cpu_count()}")
+    print(f"{'map':<18}{'put_many ops/s':>16}{'get_many ops/s':>16}")
+
+    puts, gets = run(hash_map_sc.HashMap(11, SeededHash()), pairs, batch)
+    print(f"{'in-process':<18}{puts:>16.0f}{gets:>16.0f}")
+    for shards in SHARDS:
+        with hash_map_sh.HashMap(11, SeededHash(), shards=shards) as map:
+            puts, gets = run(map, pairs, batch)
+        print(f"{str(shards) + ' shards':<18}{puts:>16.0f}{gets:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
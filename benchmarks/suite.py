@@ -0,0 +1,430 @@
+# Course: CS261 - Data Structures
+# Description: Runs every HashMap implementation through a set of standard
+#              workloads, for each key type and hash function, and reports
+#              throughput, per-operation latency percentiles, peak memory
+#              and probe or chain lengths. Results can be saved as JSON and
+#              compared against an earlier run to spot regressions. Every
+#              key, operation sequence and hash seed comes from --seed, so
+#              runs with the same arguments do the same work.
+#
+# Usage: python -m benchmarks.suite [--size N] [--seed S] [--json PATH]
+#                                   [--compare PATH] [--threshold PCT]
+#                                   [--maps ...] [--workloads ...]
+#                                   [--keys ...] [--functions ...]
+#                                   [--memory]
+
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import hash_map_cc
+import hash_map_ch
+import hash_map_oa
+import hash_map_od
+import hash_map_rh
+import hash_map_sc
+from a6_include import KeyedHash, hash_function_2, mix_hash
+
+
+# Each map is built as factory(capacity, function). Maps marked True can
+# only use a seeded hash family, such as mix_hash.
+MAPS = (
+    ("oa.HashMap", hash_map_oa.HashMap, False),
+    ("oa.CompactHashMap", hash_map_oa.CompactHashMap, False),
+    ("oa.IncrementalHashMap", hash_map_oa.IncrementalHashMap, False),
+    ("od.HashMap", hash_map_od.HashMap, False),
+    ("rh.HashMap", hash_map_rh.HashMap, False),
+    ("ch.HashMap", hash_map_ch.HashMap, True),
+    ("sc.HashMap", hash_map_sc.HashMap, False),
+    ("sc.IncrementalHashMap", hash_map_sc.IncrementalHashMap, False),
+    ("sc.FrequencyCounter", hash_map_sc.FrequencyCounter, False),
+    ("cc.HashMap", hash_map_cc.HashMap, False),
+)
+
+# Each function is (name, factory, key types it accepts, seeded family)
+FUNCTIONS = (
+    ("hash_function_2", lambda seed: hash_function_2, ('str',), False),
+    ("mix_hash", lambda seed: mix_hash, ('str', 'int'), True),
+    ("KeyedHash", lambda seed: KeyedHash(seed), ('str', 'int'), False),
+)
+
+KEY_TYPES = ('str', 'int')
+
+WORKLOADS = ('uniform_reads', 'zipf_reads', 'ingest', 'growth', 'churn',
+             'find_mode')
+
+# Share of uniform reads that look for a missing key
+MISS_RATIO = 0.1
+
+
+def make_keys(key_type: str, count: int, rng: random.Random) -> list:
+    """Returns count distinct keys of the given type."""
+    if key_type == 'str':
+        return ['key' + str(rng.getrandbits(40)) + '_' + str(i)
+                for i in range(count)]
+    keys = set()
+    while len(keys) < count:
+        keys.add(rng.getrandbits(48))
+    return list(keys)
+
+
+def zipf_choices(keys: list, count: int, rng: random.Random) -> list:
+    """
+    Returns count keys drawn from keys with a Zipf distribution, where the
+    key at rank r has weight 1 / r.
+    """
+    weights = []
+    total = 0.0
+    for rank in range(1, len(keys) + 1):
+        total += 1 / rank
+        weights.append(total)
+    return rng.choices(keys, cum_weights=weights, k=count)
+
+
+def build_workload(workload: str, keys: list, misses: list,
+                   rng: random.Random) -> tuple:
+    """
+    Returns the initial capacity, the (key, value) pairs put before timing
+    starts, and the timed operations as (method name, args) tuples. Values
+    are ints, so that a FrequencyCounter can hold them as counts. The
+    'count' method counts a token: add() on a FrequencyCounter, get() then
+    put() on any other map, as find_mode used to.
+    """
+    size = len(keys)
+    if workload == 'uniform_reads':
+        operations = [('get', (misses[rng.randrange(size)]
+                               if rng.random() < MISS_RATIO
+                               else keys[rng.randrange(size)],))
+                      for _ in range(size)]
+        return size, list(zip(keys, range(size))), operations
+    if workload == 'zipf_reads':
+        operations = [('get', (key,)) for key in zipf_choices(keys, size, rng)]
+        return size, list(zip(keys, range(size))), operations
+    if workload in ('ingest', 'growth'):
+        capacity = size if workload == 'ingest' else 1
+        return capacity, [], [('put', pair) for pair in zip(keys, range(size))]
+    if workload == 'churn':
+        # A sliding window: each new key is put as the oldest is removed
+        half = size // 2
+        operations = []
+        for i in range(half):
+            operations.append(('put', (keys[half + i], i)))
+            operations.append(('remove', (keys[i],)))
+        return half, list(zip(keys[:half], range(half))), operations
+    if workload == 'find_mode':
+        tokens = zipf_choices(keys, size, rng)
+        return 1, [], [('count', (token,)) for token in tokens]
+    raise ValueError("unknown workload " + workload)
+
+
+def resolve(map, name: str):
+    """Returns the callable for the named operation on the given map."""
+    if name != 'count':
+        return getattr(map, name)
+    if hasattr(map, 'add'):
+        return map.add
+
+    def count(key):
+        previous = map.get(key)
+        map.put(key, 1 if previous is None else previous + 1)
+    return count
+
+
+def prepare(factory, function, capacity: int, pairs: list) -> tuple:
+    """
+    Returns a new map filled with pairs, and a function that resolves
+    operation names on it.
+    """
+    map = factory(capacity, function)
+    for key, value in pairs:
+        map.put(key, value)
+    methods = {}
+
+    def method(name):
+        if name not in methods:
+            methods[name] = resolve(map, name)
+        return methods[name]
+    return map, method
+
+
+def time_operations(map, method, operations: list) -> list:
+    """
+    Performs the operations on the map and returns the time each took, in
+    seconds. The garbage collector is paused meanwhile, so that its pauses
+    are not charged to whichever operation they interrupt.
+    """
+    calls = [(method(name), args) for name, args in operations]
+    latencies = []
+    clock = time.perf_counter
+    gc.collect()
+    gc.disable()
+    try:
+        for call, args in calls:
+            start = clock()
+            call(*args)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def peak_memory(factory, function, capacity: int, pairs: list,
+                operations: list) -> int:
+    """
+    Repeats a workload under tracemalloc and returns the peak number of
+    bytes allocated by the map while being filled and used. The pairs and
+    operations are created beforehand, so they are not counted.
+    """
+    tracemalloc.start()
+    try:
+        map, method = prepare(factory, function, capacity, pairs)
+        for name, args in operations:
+            method(name)(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def probe_stats(map, function) -> tuple:
+    """
+    Returns the mean and longest number of slots a lookup examines to find
+    each stored key (open addressing) or the mean and longest non-empty
+    chain (separate chaining), or (None, None) for maps with neither.
+    """
+    if isinstance(map, (hash_map_oa.IncrementalHashMap,
+                        hash_map_sc.IncrementalHashMap)):
+        map.finish_resize()
+
+    if isinstance(map, hash_map_oa.HashMap):
+        keys = map.get_keys().as_list()
+        lengths = [map._find_slot(key, function(key) & (2 ** 64 - 1))[1]
+                   for key in keys]
+    elif isinstance(map, hash_map_rh.HashMap):
+        lengths = [map._probe_length(key) for key in map.get_keys().as_list()]
+    elif isinstance(map, hash_map_sc.HashMap):
+        lengths = [map._buckets[i].length() for i in range(map.get_capacity())]
+        lengths = [length for length in lengths if length]
+    elif isinstance(map, hash_map_cc.HashMap):
+        lengths = [bucket.length() for bucket in map._table[0]]
+        lengths = [length for length in lengths if length]
+    else:
+        return None, None
+
+    if not lengths:
+        return 0.0, 0
+    return sum(lengths) / len(lengths), max(lengths)
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Returns the given percentile of a sorted list, in microseconds."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1e6
+
+
+def run_case(map_name: str, factory, function_name: str, function,
+             key_type: str, workload: str, size: int, seed: int,
+             memory: bool) -> dict:
+    """Runs one workload on one map and returns its result record."""
+    rng = random.Random(f"{seed}/{key_type}/{workload}")
+    keys = make_keys(key_type, size, rng)
+    misses = make_keys(key_type, size, rng)
+    capacity, pairs, operations = build_workload(workload, keys, misses, rng)
+
+    map, method = prepare(factory, function, capacity, pairs)
+    latencies = time_operations(map, method, operations)
+    mean_probes, max_probes = probe_stats(map, function)
+    total = sum(latencies)
+    latencies.sort()
+
+    return {
+        "map": map_name,
+        "workload": workload,
+        "key_type": key_type,
+        "function": function_name,
+        "operations": len(operations),
+        "seconds": total,
+        "ops_per_sec": len(operations) / total if total else None,
+        "p50_us": percentile(latencies, 0.5),
+        "p90_us": percentile(latencies, 0.9),
+        "p99_us": percentile(latencies, 0.99),
+        "p999_us": percentile(latencies, 0.999),
+        "max_us": latencies[-1] * 1e6,
+        "peak_kb": (peak_memory(factory, function, capacity, pairs,
+                                operations) / 1024 if memory else None),
+        "mean_probes": mean_probes,
+        "max_probes": max_probes,
+        "final_size": map.get_size(),
+        "final_capacity": map.get_capacity(),
+    }
+
+
+def selected(names, wanted) -> list:
+    """
+    Returns the names matching any of the wanted prefixes, or all names if
+    none are wanted.
+    """
+    if not wanted:
+        return list(names)
+    return [name for name in names
+            if any(name.startswith(prefix) for prefix in wanted)]
+
+
+def environment() -> dict:
+    """Returns a description of the machine and source tree being measured."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_suite(size: int, seed: int, maps=None, workloads=None, keys=None,
+              functions=None, memory: bool = False, report=print) -> dict:
+    """
+    Runs every selected combination of map, workload, key type and hash
+    function, passing each result to report as it completes, and returns
+    the whole run as a JSON-ready dict.
+    """
+    map_names = selected([name for name, _, _ in MAPS], maps)
+    function_names = selected([name for name, _, _, _ in FUNCTIONS],
+                              functions)
+    results = []
+    for map_name, factory, seeded_only in MAPS:
+        if map_name not in map_names:
+            continue
+        for function_name, make_function, key_types, seeded in FUNCTIONS:
+            if function_name not in function_names:
+                continue
+            if seeded_only and not seeded:
+                continue
+            for key_type in selected(KEY_TYPES, keys):
+                if key_type not in key_types:
+                    continue
+                for workload in selected(WORKLOADS, workloads):
+                    result = run_case(map_name, factory, function_name,
+                                      make_function(seed), key_type,
+                                      workload, size, seed, memory)
+                    results.append(result)
+                    report(result)
+    return {
+        "suite": "benchmarks.suite",
+        "size": size,
+        "seed": seed,
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def case_key(result: dict) -> tuple:
+    """Returns the fields identifying which case a result belongs to."""
+    return (result["map"], result["workload"], result["key_type"],
+            result["function"])
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """
+    Prints the change in throughput and p99 latency of every case found in
+    both runs, marking those whose throughput fell by more than threshold
+    percent. Returns the number of cases so marked.
+    """
+    previous = {case_key(result): result for result in baseline["results"]}
+    if baseline.get("size") != current["size"]:
+        print(f"warning: baseline size {baseline.get('size')} differs from "
+              f"{current['size']}")
+    print(f"\n{'map':<24}{'workload':<15}{'keys':<5}{'function':<17}"
+          f"{'ops/s':>9}{'p99':>9}")
+    regressions = 0
+    for result in current["results"]:
+        old = previous.get(case_key(result))
+        if old is None or not old["ops_per_sec"] or not result["ops_per_sec"]:
+            continue
+        throughput = (result["ops_per_sec"] / old["ops_per_sec"] - 1) * 100
+        latency = (result["p99_us"] / old["p99_us"] - 1) * 100
+        flag = ''
+        if throughput < -threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{result['map']:<24}{result['workload']:<15}"
+              f"{result['key_type']:<5}{result['function']:<17}"
+              f"{throughput:>+8.1f}%{latency:>+8.1f}%{flag}")
+    print(f"\n{regressions} regression(s) beyond {threshold:g}%")
+    return regressions
+
+
+def cell(value, width: int, spec: str = '') -> str:
+    """Formats a number right-aligned in width columns, or '-' if None."""
+    return f"{'-' if value is None else format(value, spec):>{width}}"
+
+
+def print_result(result: dict) -> None:
+    """Prints one result as a table row."""
+    print(f"{result['map']:<24}{result['workload']:<15}{result['key_type']:<5}"
+          f"{result['function']:<17}{cell(result['ops_per_sec'], 10, '.0f')}"
+          f"{result['p50_us']:>8.2f}{result['p99_us']:>8.2f}"
+          f"{result['p999_us']:>9.2f}{cell(result['peak_kb'], 10, '.0f')}"
+          f"{cell(result['mean_probes'], 8, '.2f')}"
+          f"{cell(result['max_probes'], 6)}")
+
+
+def main(argv=None) -> int:
+    """
+    Parses the command line, runs the suite and prints a row per case.
+    Returns the exit status: 1 if a comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Benchmark the HashMap implementations.")
+    parser.add_argument('--size', type=int, default=10000,
+                        help="keys (and operations) per workload")
+    parser.add_argument('--seed', type=int, default=261,
+                        help="seed for keys, operations and hash functions")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="compare against results saved with --json")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="throughput drop, in percent, reported as a "
+                             "regression")
+    parser.add_argument('--maps', nargs='*', help="map name prefixes")
+    parser.add_argument('--workloads', nargs='*', help="workload prefixes")
+    parser.add_argument('--keys', nargs='*', help="key types")
+    parser.add_argument('--functions', nargs='*', help="function prefixes")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure peak memory, in a second pass "
+                             "that makes each case about ten times slower")
+    args = parser.parse_args(argv)
+
+    print(f"{'map':<24}{'workload':<15}{'keys':<5}{'function':<17}"
+          f"{'ops/s':>10}{'p50 us':>8}{'p99 us':>8}{'p99.9 us':>9}"
+          f"{'peak KB':>10}{'probes':>8}{'max':>6}")
+    run = run_suite(args.size, args.seed, args.maps, args.workloads,
+                    args.keys, args.functions, args.memory,
+                    print_result)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(run, file, indent=1)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        return 1 if compare(baseline, run, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+# Course: CS261 - Data Structures
+# Description: A thread-safe hash map using separate chaining, with lock
+#              striping. Buckets are divided among a fixed number of locks,
+#              so writers to different stripes proceed in parallel, while
+#              reads take no lock at all. Resizing takes every lock and
+#              publishes the new bucket array in a single assignment.
+
+
+import threading
+
+from a6_include import (DynamicArray, LinkedList, hash_function_1,
+                        hash_function_2, keyed_function, to_list)
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=None, max_load: float = 1.0,
+                 stripes: int = 16, seed: int = None) -> None:
+        """
+        Initialize new HashMap that uses separate chaining, guarded by the
+        given number of striped locks. The capacity is kept a multiple of
+        the stripe count, so every bucket belongs to exactly one stripe
+        (bucket i to stripe i % stripes) at every capacity, and a key's
+        stripe never changes when the table resizes.
+        If function is None, keys are hashed with a KeyedHash using seed, or
+        a random seed if none is given.
+        """
+        self._hash_function = keyed_function(function, seed)
+        self._max_load = max_load
+        self._stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Entry count per stripe, each only changed under its stripe's lock
+        self._counts = [0] * stripes
+        self._table = self._new_table(self._round_capacity(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        buckets = self._table[0]
+        out = ''
+        for i in range(len(buckets)):
+            out += str(i) + ': ' + str(buckets[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map. While other threads are writing, this is a
+        snapshot that may already be out of date.
+        """
+        return sum(self._counts)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table. If an
+        element already exists with that key, updates its value instead.
+        """
+        hash = self._hash_function(key)
+        stripe = hash % self._stripes
+        with self._locks[stripe]:
+            buckets, capacity = self._table
+            bucket = buckets[hash % capacity]
+            node = bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+                return
+            bucket.insert(key, value, hash)
+            self._counts[stripe] += 1
+            # Each stripe holds its share of the buckets, so it can decide
+            # alone when the table as a whole is getting too full
+            grow = (self._counts[stripe] * self._stripes
+                    > capacity * self._max_load)
+
+        # Resizing takes every lock, so it must wait until this one is free
+        if grow:
+            self._grow(capacity)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the stored value associated with a given key. If value
+        is not present, returns None. Takes no lock.
+        """
+        hash = self._hash_function(key)
+        buckets, capacity = self._table
+        node = buckets[hash % capacity].contains(key, hash)
+        return None if node is None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if given key is present in hash map, False otherwise.
+        Takes no lock.
+        """
+        hash = self._hash_function(key)
+        buckets, capacity = self._table
+        return buckets[hash % capacity].contains(key, hash) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key (and associated value) from hash map. If the key
+        is not present in the map, does nothing.
+        """
+        hash = self._hash_function(key)
+        stripe = hash % self._stripes
+        with self._locks[stripe]:
+            buckets, capacity = self._table
+            if buckets[hash % capacity].remove(key, hash):
+                self._counts[stripe] -= 1
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of buckets in the current hash table which
+        contain no elements.
+        """
+        buckets = self._table[0]
+        return sum(1 for bucket in buckets if bucket.length() == 0)
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the current hash table.
+        """
+        return self.get_size() / self._table[1]
+
+    def clear(self) -> None:
+        """
+        Empties the current hash table of its contents, while
+        preserving its capacity.
+        """
+        self._acquire_all()
+        try:
+            self._table = self._new_table(self._table[1])
+            self._counts = [0] * self._stripes
+        finally:
+            self._release_all()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the hash table to given capacity (rounded up to a multiple
+        of the stripe count), re-hashing and storing existing elements.
+        Does nothing if provided capacity is < 1.
+        """
+        if new_capacity < 1:
+            return
+        self._acquire_all()
+        try:
+            self._rehash(self._round_capacity(new_capacity))
+        finally:
+            self._release_all()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns an unordered DynamicArray holding all keys currently in hash
+        map. Takes no lock, so keys written concurrently may or may not be
+        included.
+        """
+        buckets = self._table[0]
+        return DynamicArray([node.key for bucket in buckets
+                             for node in bucket])
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would.
+        """
+        for key, value in to_list(pairs):
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that rounds a capacity up to a multiple of the stripe
+        count.
+        """
+        return max(1, -(-capacity // self._stripes)) * self._stripes
+
+    def _new_table(self, capacity: int) -> tuple:
+        """
+        Helper method that returns an empty table of the given capacity: a
+        (buckets, capacity) pair, so that both can be read together in one
+        step by a reader that takes no lock.
+        """
+        return [LinkedList() for _ in range(capacity)], capacity
+
+    def _acquire_all(self) -> None:
+        """
+        Helper method that takes every stripe lock, always in the same order
+        so that two threads doing so cannot deadlock.
+        """
+        for lock in self._locks:
+            lock.acquire()
+
+    def _release_all(self) -> None:
+        """
+        Helper method that releases every stripe lock.
+        """
+        for lock in self._locks:
+            lock.release()
+
+    def _grow(self, capacity: int) -> None:
+        """
+        Helper method that doubles the table, unless another thread has
+        already resized it since it was found to be too full at the given
+        capacity.
+        """
+        self._acquire_all()
+        try:
+            if self._table[1] == capacity:
+                self._rehash(capacity * 2)
+        finally:
+            self._release_all()
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper method, called with every lock held, that fills a new table
+        with the existing elements by their cached hashes and publishes it.
+        Readers still walking the old table see it unchanged.
+        """
+        buckets, capacity = self._new_table(new_capacity)
+        for bucket in self._table[0]:
+            for node in bucket:
+                buckets[node.hash % capacity].insert(node.key, node.value,
+                                                     node.hash)
+        self._table = buckets, capacity
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nconcurrent put and get")
+    print("----------------------")
+    m = HashMap(16, hash_function_2, stripes=4)
+
+    def writer(start: int) -> None:
+        for i in range(start, start + 250):
+            m.put('str' + str(i), i)
+
+    threads = [threading.Thread(target=writer, args=(i * 250,))
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    print(all(m.get('str' + str(i)) == i for i in range(1000)))
@@ -0,0 +1,380 @@
+# Course: CS261 - Data Structures
+# Description: An implementation of a hash map using cuckoo hashing. Each key
+#              has exactly one candidate slot in each of two or more tables,
+#              one hash function per table, plus a small overflow stash, so a
+#              lookup examines a fixed number of slots however full the map
+#              is. An insert that keeps displacing entries in a cycle draws
+#              new hash functions and rehashes.
+
+
+import random
+from functools import partial
+
+from a6_include import DynamicArray, mix_hash, next_prime, to_list
+
+
+# Marks an empty slot
+_EMPTY = object()
+
+# Default max_load by number of tables, below the load at which cuckoo
+# insertion starts failing for that many tables
+_DEFAULT_MAX_LOAD = {2: 0.45, 3: 0.8}
+
+# Attempts at rehashing with fresh functions before growing the tables
+_REHASH_ATTEMPTS = 3
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=mix_hash, tables: int = 2,
+                 stash_size: int = 4, max_load: float = None) -> None:
+        """
+        Initialize new HashMap that uses cuckoo hashing. The function must
+        belong to a seeded family, taking the key and a seed keyword (such as
+        mix_hash or fnv1a_hash); each table uses it with its own random
+        seed. The capacity is split evenly across the tables.
+        """
+        if tables < 2:
+            raise ValueError("cuckoo hashing needs at least two tables")
+        self._function = function
+        self._tables = tables
+        self._stash_size = stash_size
+        self._max_load = (max_load if max_load is not None
+                          else _DEFAULT_MAX_LOAD.get(tables, 0.9))
+        self._size = 0
+        self._rehashes = 0
+        self._allocate(self._table_capacity_for(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output, one table
+        after another followed by the stash.
+        """
+        out = ''
+        for table in range(self._tables):
+            keys, values = self._keys[table], self._values[table]
+            for i in range(self._table_capacity):
+                out += str(table) + '.' + str(i) + ': '
+                if keys[i] is _EMPTY:
+                    out += 'None\n'
+                else:
+                    out += 'K: ' + str(keys[i]) + ' V: ' + str(values[i]) + '\n'
+        for key, value in self._stash:
+            out += 'stash: K: ' + str(key) + ' V: ' + str(value) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map: the total number of slots in all tables,
+        not counting the stash
+        """
+        return self._table_capacity * self._tables
+
+    def get_rehash_count(self) -> int:
+        """
+        Returns the number of times the map has drawn new hash functions
+        after an insertion cycle.
+        """
+        return self._rehashes
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table, or updates
+        the value if the key is already present.
+        """
+        table, index = self._find(key)
+        if table >= 0:
+            self._values[table][index] = value
+            return
+        if index >= 0:
+            self._stash[index][1] = value
+            return
+
+        if self._size + 1 > self.get_capacity() * self._max_load:
+            self._rebuild(next_prime(self._table_capacity * 2),
+                          [(key, value)])
+        else:
+            self._insert(key, value)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the current hash table.
+        """
+        return self._size / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the current hash table.
+        """
+        return self.get_capacity() - (self._size - len(self._stash))
+
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of tombstones, which is always zero: every key
+        has a fixed set of candidate slots, so removal just empties one.
+        """
+        return 0
+
+    def occupied_load(self) -> float:
+        """
+        Returns the fraction of buckets that are not empty.
+        """
+        return 1 - self.empty_buckets() / self.get_capacity()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer and resizes the hash table's total capacity to at
+        least that number, growing further if needed to keep the load under
+        max_load. Draws new hash functions for the tables.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        self._rebuild(self._table_capacity_for(new_capacity), [])
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key and returns the value stored with it, or None if the
+        key does not exist.
+        """
+        for table in range(self._tables):
+            index = self._hashes[table](key) % self._table_capacity
+            if self._keys[table][index] == key:
+                return self._values[table][index]
+        for stashed in self._stash:
+            if stashed[0] == key:
+                return stashed[1]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key and returns a boolean denoting whether it is a valid key
+        in the current hash table.
+        """
+        table, index = self._find(key)
+        return index >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key and removes the element with that key from the hash
+        table. If key is not found, does nothing.
+        """
+        table, index = self._find(key)
+        if index < 0:
+            return
+        self._size -= 1
+        if table < 0:
+            self._stash.pop(index)
+            return
+
+        self._keys[table][index] = _EMPTY
+        self._values[table][index] = None
+        # The freed slot may give a stashed entry somewhere to go
+        if self._stash:
+            stash, self._stash = self._stash, []
+            for stashed_key, stashed_value in stash:
+                self._insert(stashed_key, stashed_value)
+
+    def clear(self) -> None:
+        """
+        Removes all stored elements from the hash table, while retaining
+        its current capacity.
+        """
+        self._size = 0
+        self._allocate(self._table_capacity)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all keys stored in the hash table.
+        """
+        keys = [key for table in self._keys for key in table
+                if key is not _EMPTY]
+        keys.extend(key for key, value in self._stash)
+        return DynamicArray(keys)
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would, resizing at most once up front.
+        """
+        pairs = to_list(pairs)
+        needed = self._size + len(pairs)
+        if needed > self.get_capacity() * self._max_load:
+            self.resize_table(needed)
+        for key, value in pairs:
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def _table_capacity_for(self, capacity: int) -> int:
+        """
+        Helper method that returns the per-table capacity for a total
+        capacity: a prime no smaller than an even share of it, large enough
+        to keep the current size under max_load.
+        """
+        table_capacity = next_prime(max(2, -(-capacity // self._tables)))
+        while self._size > table_capacity * self._tables * self._max_load:
+            table_capacity = next_prime(table_capacity * 2)
+        return table_capacity
+
+    def _allocate(self, table_capacity: int) -> None:
+        """
+        Helper method that replaces the tables with empty ones of the given
+        capacity, each with a newly seeded hash function, and empties the
+        stash.
+        """
+        self._table_capacity = table_capacity
+        self._keys = [[_EMPTY] * table_capacity for _ in range(self._tables)]
+        self._values = [[None] * table_capacity for _ in range(self._tables)]
+        self._hashes = [partial(self._function, seed=random.getrandbits(64))
+                        for _ in range(self._tables)]
+        self._stash = []
+        # Bound on displacements before an insertion is treated as a cycle
+        self._max_kicks = 6 * table_capacity.bit_length()
+
+    def _find(self, key: str) -> tuple:
+        """
+        Helper method that locates a key. Returns (table, index) if it is in
+        a table, (-1, index) if it is in the stash, and (-1, -1) otherwise.
+        """
+        for table in range(self._tables):
+            index = self._hashes[table](key) % self._table_capacity
+            if self._keys[table][index] == key:
+                return table, index
+        for index in range(len(self._stash)):
+            if self._stash[index][0] == key:
+                return -1, index
+        return -1, -1
+
+    def _place(self, key: str, value: object) -> tuple:
+        """
+        Helper method that stores a new key-value pair in the tables,
+        displacing entries into their other tables as needed. Returns None
+        once everything has a slot, or the pair left without one if the
+        displacements went on too long.
+        """
+        tables, capacity = self._tables, self._table_capacity
+        # The table the current entry was just displaced from
+        came_from = -1
+
+        for _ in range(self._max_kicks):
+            indices = [self._hashes[table](key) % capacity
+                       for table in range(tables)]
+            for table in range(tables):
+                if table != came_from and self._keys[table][indices[table]] is _EMPTY:
+                    self._keys[table][indices[table]] = key
+                    self._values[table][indices[table]] = value
+                    return None
+
+            # Every candidate slot is taken: evict from the next table over
+            table = (came_from + 1) % tables
+            index = indices[table]
+            keys, values = self._keys[table], self._values[table]
+            keys[index], key = key, keys[index]
+            values[index], value = value, values[index]
+            came_from = table
+        return key, value
+
+    def _insert(self, key: str, value: object) -> None:
+        """
+        Helper method that stores a new key-value pair without checking the
+        load, using the stash for an entry left homeless by a cycle, and
+        rehashing if the stash is full.
+        """
+        homeless = self._place(key, value)
+        if homeless is None:
+            return
+        if len(self._stash) < self._stash_size:
+            self._stash.append(list(homeless))
+            return
+        self._rehashes += 1
+        self._rebuild(self._table_capacity, [homeless])
+
+    def _rebuild(self, table_capacity: int, pending: list) -> None:
+        """
+        Helper method that reinserts every stored entry, plus the pending
+        pairs, into new tables of the given capacity with fresh hash
+        functions. If insertion keeps failing, the tables grow.
+        """
+        entries = [(key, values[i])
+                   for keys, values in zip(self._keys, self._values)
+                   for i, key in enumerate(keys) if key is not _EMPTY]
+        entries.extend((key, value) for key, value in self._stash)
+        entries.extend(pending)
+
+        attempts = 0
+        while True:
+            self._allocate(table_capacity)
+            if self._place_all(entries):
+                return
+            attempts += 1
+            if attempts % _REHASH_ATTEMPTS == 0:
+                table_capacity = next_prime(table_capacity * 2)
+
+    def _place_all(self, entries: list) -> bool:
+        """
+        Helper method that places entries into freshly allocated tables.
+        Returns False as soon as one can be placed in neither the tables nor
+        the stash.
+        """
+        for key, value in entries:
+            homeless = self._place(key, value)
+            if homeless is not None:
+                if len(self._stash) == self._stash_size:
+                    return False
+                self._stash.append(list(homeless))
+        return True
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove")
+    print("-------------------")
+    m = HashMap(8, mix_hash)
+    for i in range(12):
+        m.put('str' + str(i), i * 100)
+    m.remove('str3')
+    print(m.get_size(), m.get_capacity(), m.get('str4'), m.contains_key('str3'))
+
+    print("\nresize_table")
+    print("------------")
+    m = HashMap(75, mix_hash)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
@@ -0,0 +1,340 @@
+# Course: CS261 - Data Structures
+# Description: A read-only hash map backed by a memory-mapped file. The file
+#              holds a fixed-layout open addressing table: a header, an
+#              array of slot hashes, an array of record offsets, and packed
+#              key/value records. Opening the file only maps it, and lookups
+#              read the arrays in place, so any number of processes share
+#              one copy of the table through the operating system's page
+#              cache.
+#
+# File layout (little-endian):
+#   header   64 bytes: magic, format version, marshal version, capacity,
+#            size, hash function name and seed (see HEADER)
+#   hashes   capacity x 8 bytes: the hash of the key in each slot
+#   offsets  capacity x 8 bytes: file offset of each slot's record, or 0
+#            for an empty slot
+#   records  key length (4 bytes), value length (4 bytes), the key as
+#            encoded by a6_include.encode_key, the value as marshal data
+
+
+import marshal
+import mmap
+import struct
+
+from a6_include import (DynamicArray, decode_key, encode_key,
+                        hash_function_from_id, hash_function_id,
+                        hash_function_2, mix_hash, to_list)
+
+
+MAGIC = b'CS261MMT'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQ16s16s')
+RECORD = struct.Struct('<II')
+
+_MASK64 = (1 << 64) - 1
+
+
+def write_table(path: str, source, function=mix_hash,
+                max_load: float = 0.5) -> None:
+    """
+    Writes the entries of source, either a HashMap (anything with items(),
+    or get_keys() and get()) or a DynamicArray or iterable of key-value
+    pairs with unique keys, to a table file at path. Keys must be str,
+    bytes or int; values anything marshal can store. The function is
+    recorded in the file, so it must be one a6_include.hash_function_id()
+    can identify. max_load must be between 0 and 1, so that the table
+    always has an empty slot to end a lookup. Records are written as they
+    are produced, so only the two slot arrays are held in memory.
+    """
+    if not 0 < max_load < 1:
+        raise ValueError("max_load must be between 0 and 1")
+    name, seed = hash_function_id(function)
+    if hasattr(source, 'items'):
+        pairs = source.items()
+        size = len(pairs)
+    elif hasattr(source, 'get_keys'):
+        keys = source.get_keys().as_list()
+        pairs = ((key, source.get(key)) for key in keys)
+        size = len(keys)
+    else:
+        pairs = to_list(source)
+        size = len(pairs)
+
+    # A power of two no more than max_load full, so slots are found by mask
+    capacity = 1
+    while size > capacity * max_load:
+        capacity *= 2
+    mask = capacity - 1
+    hashes = [0] * capacity
+    offsets = [0] * capacity
+
+    with open(path, 'wb') as file:
+        offset = HEADER.size + 16 * capacity
+        file.seek(offset)
+        for key, value in pairs:
+            key_bytes = encode_key(key)
+            value_bytes = marshal.dumps(value)
+            hash = function(key) & _MASK64
+            index = hash & mask
+            while offsets[index]:
+                index = (index + 1) & mask
+            hashes[index] = hash
+            offsets[index] = offset
+            file.write(RECORD.pack(len(key_bytes), len(value_bytes)))
+            file.write(key_bytes)
+            file.write(value_bytes)
+            offset += RECORD.size + len(key_bytes) + len(value_bytes)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, marshal.version, capacity,
+                               size, name.encode('ascii'),
+                               seed.to_bytes(16, 'little')))
+        file.write(struct.pack('<%dQ' % capacity, *hashes))
+        file.write(struct.pack('<%dQ' % capacity, *offsets))
+
+
+class HashMap:
+    def __init__(self, path: str) -> None:
+        """
+        Initialize a read-only HashMap over the table file at path, as
+        written by write_table(). Raises ValueError if the file is not such
+        a table, or if its values use a newer marshal format than this
+        Python can read.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a hash table file")
+
+        (magic, version, marshal_version, capacity, size, name,
+         seed) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} "
+                             f"hash table file")
+        if marshal_version > marshal.version:
+            self.close()
+            raise ValueError(f"{path} uses marshal version {marshal_version}, "
+                             f"newer than {marshal.version}")
+
+        self._capacity = capacity
+        self._size = size
+        self._hash_function = hash_function_from_id(
+            name.rstrip(b'\0').decode('ascii'),
+            int.from_bytes(seed, 'little'))
+        self._view = memoryview(self._mmap)
+        self._hashes = self._view[HEADER.size:HEADER.size + 8 * capacity].cast('Q')
+        self._offsets = self._view[HEADER.size + 8 * capacity:
+                                   HEADER.size + 16 * capacity].cast('Q')
+
+    def __enter__(self) -> "HashMap":
+        """Return the map, to be closed on leaving the with block."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Unmap the table file."""
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._offsets[i]:
+                key, value = self._record(self._offsets[i])
+                out += str(i) + ': K: ' + str(key) + ' V: ' + str(value) + '\n'
+            else:
+                out += str(i) + ': None\n'
+        return out
+
+    def close(self) -> None:
+        """
+        Unmaps the table file. The map cannot be used afterwards.
+        """
+        for name in ('_hashes', '_offsets', '_view'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key and returns the value stored with it, or None if the
+        key does not exist. Only the value of a matching entry is decoded.
+        """
+        offset = self._find(key)
+        if not offset:
+            return None
+        key_length, value_length = RECORD.unpack_from(self._mmap, offset)
+        start = offset + RECORD.size + key_length
+        return marshal.loads(self._view[start:start + value_length])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key and returns a boolean denoting whether it is a valid key
+        in the table.
+        """
+        return self._find(key) != 0
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the table.
+        """
+        return self._capacity - self._size
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all keys stored in the table.
+        """
+        keys = []
+        view = self._view
+        for offset in self._offsets:
+            if offset:
+                key_length = RECORD.unpack_from(self._mmap, offset)[0]
+                start = offset + RECORD.size
+                keys.append(decode_key(view[start:start + key_length]))
+        return DynamicArray(keys)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Not supported: the table is read-only. Build a new file with
+        write_table() instead.
+        """
+        raise TypeError("memory-mapped HashMap is read-only")
+
+    def remove(self, key: str) -> None:
+        """
+        Not supported: the table is read-only.
+        """
+        raise TypeError("memory-mapped HashMap is read-only")
+
+    def clear(self) -> None:
+        """
+        Not supported: the table is read-only.
+        """
+        raise TypeError("memory-mapped HashMap is read-only")
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Not supported: the table is read-only.
+        """
+        raise TypeError("memory-mapped HashMap is read-only")
+
+    def _find(self, key: str) -> int:
+        """
+        Helper method that returns the file offset of the record for key,
+        or 0 if it is not present. Stored keys are compared as encoded
+        bytes, without decoding them. No more than capacity slots are
+        examined, so even a table with no empty slot cannot loop forever.
+        """
+        hash = self._hash_function(key) & _MASK64
+        hashes, offsets, view = self._hashes, self._offsets, self._view
+        mask = self._capacity - 1
+        index = hash & mask
+        key_bytes = None
+
+        for _ in range(self._capacity):
+            offset = offsets[index]
+            if not offset:
+                break
+            if hashes[index] == hash:
+                if key_bytes is None:
+                    key_bytes = encode_key(key)
+                key_length = RECORD.unpack_from(self._mmap, offset)[0]
+                start = offset + RECORD.size
+                if view[start:start + key_length] == key_bytes:
+                    return offset
+            index = (index + 1) & mask
+        return 0
+
+    def _record(self, offset: int) -> tuple:
+        """
+        Helper method that decodes the key-value pair stored at offset.
+        """
+        key_length, value_length = RECORD.unpack_from(self._mmap, offset)
+        start = offset + RECORD.size
+        key = decode_key(self._view[start:start + key_length])
+        start += key_length
+        return key, marshal.loads(self._view[start:start + value_length])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("\nwrite_table and lookups")
+    print("-----------------------")
+    path = os.path.join(tempfile.mkdtemp(), 'table.bin')
+    write_table(path, DynamicArray([('str' + str(i), i * 10) for i in range(8)]),
+                hash_function_2)
+    with HashMap(path) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str3'), m.get('str9'))
+        print(m.contains_key('str7'), m.contains_key('str8'))
+        print(m)
+    os.remove(path)
+
+    print("\nmax_load must leave an empty slot")
+    print("---------------------------------")
+    try:
+        write_table(path, DynamicArray([('str' + str(i), i) for i in range(8)]),
+                    hash_function_2, max_load=1.0)
+    except ValueError as error:
+        print(error)
+    write_table(path, DynamicArray([('str' + str(i), i) for i in range(8)]),
+                hash_function_2, max_load=0.99)
+    with HashMap(path) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str9'),
+              m.contains_key('missing'))
+    os.remove(path)
+
+    print("\ntables from a newer marshal version are refused")
+    print("-----------------------------------------------")
+    write_table(path, DynamicArray([('str1', 1)]), hash_function_2)
+    with open(path, 'r+b') as file:
+        file.seek(len(MAGIC) + 4)
+        file.write((marshal.version + 1).to_bytes(4, 'little'))
+    try:
+        HashMap(path)
+    except ValueError as error:
+        print(error.args[0].replace(path, 'table'))
+    else:
+        raise AssertionError("newer marshal version was accepted")
+    os.remove(path)
@@ -6,25 +6,76 @@
 # Description: An implementation of a hash map using open addressing to resolve collisions. 
 
 
-from asyncio import proactor_events
-from a6_include import (DynamicArray, HashEntry,
-                        hash_function_1, hash_function_2)
+import copy
+import marshal
+import time
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, MapStats, MapView,
+                        hash_function_1, hash_function_2,
+                        hash_function_from_id, keyed_function,
+                        matches_hash_function, next_prime,
+                        read_snapshot_header, to_list,
+                        write_snapshot_header)
+
+
+# How far the probe step grows after each probe, for each probing strategy.
+# Probing visits index, index + delta, index + delta + (delta + accel), ...
+_PROBE_ACCELERATION = {
+    'linear': 0,        # offsets 1, 2, 3, ...
+    'quadratic': 2,     # offsets 1, 4, 9, ...
+    'triangular': 1,    # offsets 1, 3, 6, ...
+    'double': 0,        # offsets k, 2k, 3k, ... for a second hash k
+}
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function=None, max_load: float = 0.5,
+                 tombstone_ratio: float = 0.25, probing: str = 'quadratic',
+                 max_probes: int = None, seed: int = None) -> None:
         """
-        Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Initialize new HashMap that uses open addressing for collision
+        resolution, probing with the given strategy: 'linear', 'quadratic'
+        (the default), 'triangular' or 'double' hashing.
+        Capacities are rounded up to a power of two for triangular probing
+        and to a prime otherwise, so every strategy is guaranteed to reach an
+        open slot. Lookups examine at most as many slots as the longest probe
+        sequence of any stored entry. If given, max_probes caps that length:
+        an insert that would need more probes grows the table first.
+        The table doubles once live entries plus tombstones reach max_load,
+        and is compacted in place once tombstones alone reach tombstone_ratio.
+        max_load must be in (0, 1] and tombstone_ratio in (0, 1).
+        If function is None, keys are hashed with a KeyedHash using seed, or
+        a random seed if none is given.
         """
-        self._buckets = DynamicArray()
-        for _ in range(capacity):
-            self._buckets.append(None)
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be greater than 0 and at most 1")
+        if not 0 < tombstone_ratio < 1:
+            raise ValueError("tombstone_ratio must be between 0 and 1")
+        if probing not in _PROBE_ACCELERATION:
+            raise ValueError(f"unknown probing strategy: {probing!r}")
+        self._probing = probing
+        self._probe_accel = _PROBE_ACCELERATION[probing]
+        self._double_hashing = probing == 'double'
+        self._max_probes = max_probes
+
+        capacity = self._round_capacity(capacity)
+        self._allocate(capacity)
 
         self._capacity = capacity
-        self._hash_function = function
+        self._reachable = self._reachable_for(capacity)
+        self._probe_limit = 1
+        self._hash_function = keyed_function(function, seed)
         self._size = 0
+        self._tombstones = 0
+        self._max_load = max_load
+        self._tombstone_ratio = tombstone_ratio
+        self._resize_time = 0.0
+        self._stats = None
+
+        # Bumped whenever the bucket array is rebuilt (by a resize,
+        # compaction or clear), so iterators can tell their slots are stale
+        self._version = 0
 
     def __str__(self) -> str:
         """
@@ -36,6 +87,24 @@ class HashMap:
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
         return out
 
+    def __iter__(self):
+        """
+        Return an iterator over the keys in the map (see keys()).
+        """
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        """
+        Return size of map, so that len() works on it
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return whether key is in the map, so that the in operator works on it
+        """
+        return self.contains_key(key)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -56,21 +125,64 @@ class HashMap:
         """
         Takes a key-value pair and stores it in the hash table. 
         """
-        # Check load factor and resize if needed
-        load_factor = self.table_load()
-        if load_factor >= 0.5:
+        self._put(key, value, self._hash_function(key))
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper method for put() that takes the key's precomputed hash,
+        so entries can be reinserted without hashing their keys again.
+        """
+        # Check occupancy (tombstones included) and resize if needed. An
+        # existing key is updated in place first, so that changing a value
+        # never moves entries (which would break iteration over the map)
+        if self.occupied_load() >= self._max_load:
+            if self._update(key, value, hash):
+                return
             self.resize_table(self._capacity * 2)
 
+        self._insert(key, value, hash)
+
+    def _update(self, key: str, value: object, hash: int) -> bool:
+        """
+        Helper method that sets the value stored with key, if it is present,
+        by precomputed hash. Returns True if the key was present.
+        """
+        index = self._get_index(key, hash)
+        if index < 0 or self._buckets[index] is None:
+            return False
+        self._buckets[index].value = value
+        return True
+
+    def _insert(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper method that stores a key-value pair by precomputed hash,
+        without checking whether the table needs to grow first.
+        """
         # Retrieve index of matching element, or first open index
-        index = self._get_index(key, False)
-        element = self._buckets[index]
-        # If index is open, insert key/value pair there
-        if element == None or element.is_tombstone:
-            self._buckets[index] = HashEntry(key, value)
-            self._size += 1
-        # Otherwise, update element's value to provided value
-        else:
+        index, probes = self._find_slot(key, hash)
+        element = self._buckets[index] if index >= 0 else None
+        # Update element's value to provided value if the key is present
+        if element is not None and not element.is_tombstone:
             element.value = value
+            return
+
+        # Grow the table if no open index is reachable, or if the one found
+        # lies further along the probe sequence than max_probes allows
+        if index < 0 or self._too_many_probes(probes):
+            self.resize_table(self._capacity * 2)
+            index, probes = self._find_slot(key, hash)
+            while index < 0:
+                self.resize_table(self._capacity * 2)
+                index, probes = self._find_slot(key, hash)
+            element = self._buckets[index]
+
+        # Insert key/value pair at the open index
+        if element is not None:
+            self._tombstones -= 1
+        self._buckets[index] = HashEntry(key, value, hash)
+        self._size += 1
+        if probes > self._probe_limit:
+            self._probe_limit = probes
 
     def table_load(self) -> float:
         """
@@ -86,34 +198,187 @@ class HashMap:
         """
         return (self._capacity - self._size)
 
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of buckets currently holding a tombstone.
+        """
+        return self._tombstones
+
+    def occupied_load(self) -> float:
+        """
+        Returns the fraction of buckets that are not empty, counting both
+        live entries and tombstones. This is what governs probe chain length.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
     def resize_table(self, new_capacity: int) -> None:
         """
-        Takes an integer and resizes the hash table's capacity to that number.
+        Takes an integer and resizes the hash table's capacity to that number,
+        rounded up as the probing strategy requires.
         """
         # Validate new capacity and return if not valid
         if new_capacity < 1 or new_capacity < self._size:
             return 
 
-        old_table = self._buckets
-        # Fill new array with requested number of buckets
-        self._buckets = DynamicArray()
-        for _ in range(new_capacity):
-            self._buckets.append(None)
+        # Keep doubling until the entries fit under the load threshold
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size > new_capacity * self._max_load:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        # ... and, should any entry land beyond the probe limit, until they
+        # can all be placed within it
+        start = time.perf_counter()
+        while not self._rehash(new_capacity):
+            new_capacity = self._round_capacity(new_capacity * 2)
+        self._version += 1
+        self._resize_time = time.perf_counter() - start
+        if self._stats is not None:
+            self._stats.record_resize(self._resize_time)
+
+    def get_resize_time(self) -> float:
+        """
+        Returns how long the most recent resize (or compaction) took,
+        in seconds.
+        """
+        return self._resize_time
+
+    def enable_stats(self) -> None:
+        """
+        Starts recording statistics: the slots examined by each lookup, the
+        number and duration of resizes (compactions included), and calls
+        to the hash function and the time spent in them. Until this is
+        called, the map records nothing.
+        """
+        if self._stats is None:
+            self._stats = MapStats()
+            self._hash_function = self._stats.timed(self._hash_function)
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording statistics and discards those recorded so far.
+        """
+        if self._stats is not None:
+            self._hash_function = self._hash_function.__wrapped__
+            self._stats = None
+
+    def reset_stats(self) -> None:
+        """
+        Sets the recorded statistics back to zero, if they are enabled.
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def get_stats(self) -> dict:
+        """
+        Returns a snapshot of the map's statistics as a dict of plain
+        values: its size, capacity, loads, tombstone count, longest probe
+        sequence and most recent resize time, plus, while statistics are
+        enabled, the counters described in enable_stats() (see
+        a6_include.MapStats.snapshot()).
+        """
+        stats = {
+            'enabled': self._stats is not None,
+            'size': self.get_size(),
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'occupied_load': self.occupied_load(),
+            'tombstones': self._tombstones,
+            'probe_limit': self._probe_limit,
+            'last_resize_seconds': self._resize_time,
+        }
+        if self._stats is not None:
+            stats.update(self._stats.snapshot())
+        return stats
+
+    def _rehash(self, new_capacity: int) -> bool:
+        """
+        Helper method for resize_table() that moves every live entry into a
+        new bucket array in one linear pass. The keys are already unique and
+        the new array is known to have room, so each entry is placed directly
+        in the first open slot for its cached hash, without load checks or
+        key comparisons. Returns False, leaving the table untouched, if some
+        entry cannot be placed within the probe limit.
+        """
+        new_table = DynamicArray([None] * new_capacity)
+        slots = new_table.as_list()
+        reachable = self._reachable_for(new_capacity)
+        accel = self._probe_accel
+        longest = 1
+
+        for entry in self._buckets.as_list():
+            if entry is None or entry.is_tombstone:
+                continue
+            hash = entry.hash
+            index = hash % new_capacity
+            delta = 1 + hash % (new_capacity - 1) if self._double_hashing else 1
+            probes = 1
+            while slots[index] is not None:
+                if probes == reachable:
+                    return False
+                probes += 1
+                index = (index + delta) % new_capacity
+                delta += accel
+            slots[index] = entry
+            if probes > longest:
+                longest = probes
+
+        self._buckets = new_table
         self._capacity = new_capacity
-        self._size = 0
+        self._reachable = reachable
+        self._probe_limit = longest
+        self._tombstones = 0
+        return True
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that rounds a capacity up to the nearest one the
+        probing strategy works with: a power of two for triangular probing,
+        whose offsets then visit every slot, and a prime otherwise. With a
+        prime capacity, double hashing visits every slot and quadratic
+        probing visits half of them, which always includes an open one while
+        the table is at most half full.
+        """
+        if self._probing == 'triangular':
+            return 1 << max(0, capacity - 1).bit_length()
+        return next_prime(capacity)
+
+    def _too_many_probes(self, probes: int) -> bool:
+        """
+        Helper method that decides whether an insert needing the given number
+        of probes should grow the table first. Only tables at least half as
+        full as max_load allows are grown: below that, long probe sequences
+        come from keys with identical hashes, which growing cannot separate.
+        """
+        return (self._max_probes is not None and probes > self._max_probes
+                and self.occupied_load() >= self._max_load / 2)
+
+    def _reachable_for(self, capacity: int) -> int:
+        """
+        Helper method returning how many distinct slots the probe sequence
+        visits in a table of the given capacity before it starts repeating.
+        """
+        if self._probing == 'quadratic':
+            return capacity // 2 + 1
+        return capacity
 
-        # Rehash and populate new array with old values
-        for i in range(old_table.length()):
-            entry = old_table[i]
-            if entry != None and entry.is_tombstone == False:
-                self.put(entry.key, entry.value)
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that replaces the bucket array with an empty one of
+        the given capacity. DynamicArray copies the list it is given, so
+        it is given a single slot, which is then repeated in place.
+        """
+        self._buckets = DynamicArray([None])
+        slots = self._buckets.as_list()
+        slots *= capacity
 
     def get(self, key: str) -> object:
         """
         Takes a string and returns the value stored with that string as key, 
         or None if key does not exist. 
         """
-        index = self._get_index(key)
+        index = self._get_index(key, self._hash_function(key))
+        if index < 0:
+            return None
         element = self._buckets[index]
         if element != None: 
             return element.value
@@ -125,31 +390,54 @@ class HashMap:
         Takes a string and returns a boolean denoting whether that string
         is a valid key in the current hash table.
         """
-        index = self._get_index(key)
-        return self._buckets[index] != None 
+        index = self._get_index(key, self._hash_function(key))
+        return index >= 0 and self._buckets[index] != None 
 
     def remove(self, key: str) -> None:
         """
         Takes a key and removes the element with that key from the 
         hash table. If key is not found, does nothing. 
         """
-        index = self._get_index(key)
+        if self._remove(key, self._hash_function(key)):
+            # Compact in place once tombstones make up too much of the table
+            if self._tombstones >= self._capacity * self._tombstone_ratio:
+                self.resize_table(self._capacity)
+
+    def _remove(self, key: str, hash: int) -> bool:
+        """
+        Helper method that turns the entry for a key into a tombstone, without
+        compacting the table. Returns True if the key was present.
+        """
+        index = self._get_index(key, hash)
+        if index < 0:
+            return False
         element = self._buckets[index]
 
         if element != None: 
             element.is_tombstone = True
             self._size -= 1
+            self._tombstones += 1
+            return True
+        return False
 
     def clear(self) -> None:
         """
         Removes all stored elements from the hash table, while retaining
-        its current capacity. 
+        its current capacity. The bucket array is replaced in one bulk
+        step, or left alone if nothing has been stored in it.
         """
+        if self._size or self._tombstones:
+            self._wipe()
         self._size = 0
-        self._buckets = DynamicArray()
+        self._tombstones = 0
+        self._probe_limit = 1
+        self._version += 1
 
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+    def _wipe(self) -> None:
+        """
+        Helper method for clear() that empties every slot.
+        """
+        self._allocate(self._capacity)
 
     def get_keys(self) -> DynamicArray:
         """
@@ -164,36 +452,887 @@ class HashMap:
         
         return keys
 
-    def _get_index(self, key: str, skip_tombstones: bool=True) -> int:
+    def keys(self) -> MapView:
         """
-        Helper method that takes a key and an optional parameter to accept/ignore 
-        tombstone values. Returns the index of the given key in the hashmap, 
-        or of the first open index if key is not found. 
+        Returns a view of the keys in the hash table, which streams them
+        from the buckets when iterated, instead of copying them as
+        get_keys() does. Iteration raises RuntimeError if the map gains or
+        loses keys, or is resized, before it finishes.
         """
-        initial_index = self._hash_function(key) % self._capacity
+        return MapView(self, 'keys')
+
+    def values(self) -> MapView:
+        """
+        Returns a view of the values in the hash table, in the same order
+        as keys().
+        """
+        return MapView(self, 'values')
+
+    def items(self) -> MapView:
+        """
+        Returns a view of the (key, value) pairs in the hash table, in the
+        same order as keys().
+        """
+        return MapView(self, 'items')
+
+    def _iter_items(self):
+        """
+        Helper method for the views that yields a (key, value) pair for
+        each live entry, in slot order, raising RuntimeError once the size
+        or bucket array has changed since the first pair.
+        """
+        version, size = self._version, self._size
+        for entry in self._buckets.as_list():
+            if entry is not None and not entry.is_tombstone:
+                yield entry.key, entry.value
+                if self._version != version or self._size != size:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would. The table is resized at most once, up
+        front, to make room for the whole batch.
+        """
+        pairs = to_list(pairs)
+        hash_function = self._hash_function
+        hashes = [hash_function(pair[0]) for pair in pairs]
+
+        # Size the table for the worst case, where every key is new
+        count = len(pairs)
+        if self._size + self._tombstones + count > self._capacity * self._max_load:
+            new_capacity = self._capacity * 2
+            while self._size + count > new_capacity * self._max_load:
+                new_capacity *= 2
+            self.resize_table(new_capacity)
+
+        insert = self._insert
+        for (key, value), hash in zip(pairs, hashes):
+            insert(key, value, hash)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        keys = to_list(keys)
+        hash_function = self._hash_function
+        slots = self._buckets.as_list()
+        get_index = self._get_index
+        values = []
+        for key in keys:
+            index = get_index(key, hash_function(key))
+            element = slots[index] if index >= 0 else None
+            values.append(None if element is None else element.value)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        keys = to_list(keys)
+        hash_function = self._hash_function
+        slots = self._buckets.as_list()
+        get_index = self._get_index
+        found = []
+        for key in keys:
+            index = get_index(key, hash_function(key))
+            found.append(index >= 0 and slots[index] is not None)
+        return DynamicArray(found)
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would, compacting the table at most once at the end.
+        """
+        keys = to_list(keys)
+        hash_function = self._hash_function
+        remove = self._remove
+        for key in keys:
+            remove(key, hash_function(key))
+
+        if self._tombstones >= self._capacity * self._tombstone_ratio:
+            self.resize_table(self._capacity)
+
+    def save(self, path: str) -> None:
+        """
+        Takes a path and writes the map to a binary snapshot file there,
+        recording its capacity, settings, hash function and exact slot
+        layout, tombstones included. Entries are written one at a time, so
+        saving needs no copy of the table. Keys and values must be types
+        marshal can store.
+        """
+        settings = {
+            'capacity': self._capacity,
+            'size': self._size,
+            'tombstones': self._tombstones,
+            'probe_limit': self._probe_limit,
+            'max_load': self._max_load,
+            'tombstone_ratio': self._tombstone_ratio,
+            'probing': self._probing,
+            'max_probes': self._max_probes,
+        }
+        with open(path, 'wb') as file:
+            write_snapshot_header(file, 'oa', self._hash_function, settings)
+
+            # Runs of empty slots are written as a positive count, runs of
+            # tombstones as a negative one, and live entries as a tuple
+            run = 0
+            for slot in self._snapshot_slots():
+                if slot is None:
+                    if run < 0:
+                        marshal.dump(run, file)
+                        run = 0
+                    run += 1
+                elif not slot:
+                    if run > 0:
+                        marshal.dump(run, file)
+                        run = 0
+                    run -= 1
+                else:
+                    if run:
+                        marshal.dump(run, file)
+                        run = 0
+                    marshal.dump(slot, file)
+            if run:
+                marshal.dump(run, file)
+
+    @classmethod
+    def load(cls, path: str, function=None) -> "HashMap":
+        """
+        Takes the path of a snapshot written by save() and returns a new map
+        holding its contents. The hash function defaults to the one recorded
+        in the snapshot. When it is that function, the slots are restored
+        exactly as saved, without rehashing. Otherwise each entry is put()
+        again. A snapshot of a map whose hash function could not be recorded
+        (see a6_include.hash_function_id) needs function to be given.
+        """
+        with open(path, 'rb') as file:
+            identity, settings = read_snapshot_header(file, 'oa')
+            if function is None:
+                if identity is None:
+                    raise ValueError("snapshot does not record its hash "
+                                     "function; pass one to load()")
+                function = hash_function_from_id(*identity)
+
+            capacity = settings['capacity']
+            map = cls(capacity, function, settings['max_load'],
+                      settings['tombstone_ratio'], settings['probing'],
+                      settings['max_probes'])
+            slots = _read_slots(file, capacity)
+            if (matches_hash_function(function, identity)
+                    and map._capacity == capacity):
+                map._restore_slots(slots)
+                map._size = settings['size']
+                map._tombstones = settings['tombstones']
+                map._probe_limit = settings['probe_limit']
+            else:
+                for index, slot in slots:
+                    if slot:
+                        map.put(slot[0], slot[1])
+        return map
+
+    def _snapshot_slots(self):
+        """
+        Helper method for save() that yields each slot in order: None if it
+        is empty, an empty tuple for a tombstone, or (key, value, hash).
+        """
+        for entry in self._buckets.as_list():
+            if entry is None:
+                yield None
+            elif entry.is_tombstone:
+                yield ()
+            else:
+                yield entry.key, entry.value, entry.hash
+
+    def _restore_slots(self, slots) -> None:
+        """
+        Helper method for load() that takes (index, slot) pairs for the
+        non-empty slots of a snapshot, each an empty tuple for a tombstone
+        or (key, value, hash), and puts them back in place.
+        """
+        buckets = self._buckets.as_list()
+        for index, slot in slots:
+            if slot:
+                buckets[index] = HashEntry(*slot)
+            else:
+                tombstone = HashEntry(None, None)
+                tombstone.is_tombstone = True
+                buckets[index] = tombstone
+
+    def _find_slot(self, key: str, hash: int) -> tuple:
+        """
+        Helper method for inserts that takes a key and its hash. Returns the
+        index of the key's entry (even if it is a tombstone), or of the first
+        open index if key is not found, along with the number of slots
+        examined to get there. The index is -1 if no open slot is reachable.
+        """
+        capacity = self._capacity
+        slots = self._buckets.as_list()
+
+        index = hash % capacity
+        delta = 1 + hash % (capacity - 1) if self._double_hashing else 1
+        accel = self._probe_accel
+        probes = 1
+        item = slots[index]
+
+        while item is not None:
+            if item.hash == hash and item.key == key:
+                return index, probes
+            if probes == self._reachable:
+                return -1, probes
+            probes += 1
+            index = (index + delta) % capacity
+            delta += accel
+            item = slots[index]
+
+        return index, probes
+
+    def _get_index(self, key: str, hash: int) -> int:
+        """
+        Helper method for lookups that takes a key and its hash. Returns the
+        index of the given key in the hashmap, or of the first open index if
+        key is not found, or -1 once the probe sequence is longer than that
+        of any stored entry.
+        """
+        capacity = self._capacity
+        slots = self._buckets.as_list()
 
         # Find first hashed index and set up for probing
-        probe_iterator = 0 
-        index = initial_index
-        item = self._buckets[index]
+        index = hash % capacity
+        delta = 1 + hash % (capacity - 1) if self._double_hashing else 1
+        accel = self._probe_accel
+        probes_left = self._probe_limit
+        item = slots[index]
 
         # Loop until empty element is found
         while item is not None: 
-            # Return if item is found (and isn't a tombstone)
-            if item.key == key and item.is_tombstone == False:
-                return index
-            # Also return on tombstones if operation requires (i.e. put())
-            elif item.key == key and skip_tombstones == False: 
-                return index 
+            # Compare cached hashes first; keys only need checking on a match
+            # Stop if item is found (and isn't a tombstone)
+            if (item.hash == hash and item.key == key
+                    and item.is_tombstone == False):
+                break
 
             # If not a match or an empty index, increment probe and continue
-            probe_iterator += 1
-            index = (initial_index + (probe_iterator ** 2)) % self._capacity
-            item = self._buckets[index]
+            probes_left -= 1
+            if probes_left == 0:
+                index = -1
+                break
+            index = (index + delta) % capacity
+            delta += accel
+            item = slots[index]
 
-        # If key not found, return index of first open spot
+        if self._stats is not None:
+            self._stats.record_probes(
+                self._probe_limit - probes_left + (index >= 0))
+
+        # If key not found, this is the index of the first open spot
         return index
 
+
+def _read_slots(file, capacity: int):
+    """
+    Yields (index, slot) for each tombstone (an empty tuple) and live entry
+    (key, value, hash) in the slot stream of a snapshot written by
+    HashMap.save(), skipping empty slots.
+    """
+    index = 0
+    while index < capacity:
+        item = marshal.load(file)
+        if type(item) is int:
+            if item < 0:
+                for tombstone_index in range(index, index - item):
+                    yield tombstone_index, ()
+            index += abs(item)
+        else:
+            yield index, item
+            index += 1
+
+
+# Slot states for CompactHashMap
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+_MASK64 = (1 << 64) - 1
+
+# Tombstone left in the old table by IncrementalHashMap for a migrated entry
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
+
+
+class CompactHashMap(HashMap):
+    """
+    HashMap with the same API and probing as above, but storing its slots
+    in parallel arrays rather than HashEntry objects: hashes in an
+    array('Q'), keys and values in flat lists, and each slot's state
+    (empty, live or tombstone) in a bytearray. This avoids a Python object
+    per entry, at the cost of slightly slower access.
+    """
+
+    def __str__(self) -> str:
+        """Override string method to provide the same output as HashMap."""
+        out = ''
+        for i in range(self._capacity):
+            state = self._states[i]
+            if state == _EMPTY:
+                entry = 'None'
+            else:
+                entry = (f"K: {self._keys[i]} V: {self._values[i]} "
+                         f"TS: {state == _TOMBSTONE}")
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that replaces the slot arrays with empty ones of the
+        given capacity.
+        """
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._states = bytearray(capacity)
+
+    def _wipe(self) -> None:
+        """
+        Helper method for clear() that empties every slot, reusing the hash
+        array: the hash of an empty slot is never read, so only the states,
+        keys and values are replaced.
+        """
+        capacity = self._capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._states = bytearray(capacity)
+
+    def _insert(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper method that stores a key-value pair by precomputed hash,
+        reusing the first tombstone on the key's probe path if it is new.
+        """
+        hash &= _MASK64
+        index, probes = self._find_slot(key, hash)
+        if index >= 0 and self._states[index] == _LIVE:
+            self._values[index] = value
+            return
+
+        # Grow the table if no open slot is reachable, or if the one found
+        # lies further along the probe sequence than max_probes allows
+        if index < 0 or self._too_many_probes(probes):
+            self.resize_table(self._capacity * 2)
+            index, probes = self._find_slot(key, hash)
+            while index < 0:
+                self.resize_table(self._capacity * 2)
+                index, probes = self._find_slot(key, hash)
+
+        if self._states[index] == _TOMBSTONE:
+            self._tombstones -= 1
+        self._states[index] = _LIVE
+        self._hashes[index] = hash
+        self._keys[index] = key
+        self._values[index] = value
+        self._size += 1
+        if probes > self._probe_limit:
+            self._probe_limit = probes
+
+    def _snapshot_slots(self):
+        """
+        Helper method for save() that yields each slot in order: None if it
+        is empty, an empty tuple for a tombstone, or (key, value, hash).
+        """
+        keys, values, hashes = self._keys, self._values, self._hashes
+        for index, state in enumerate(self._states):
+            if state == _EMPTY:
+                yield None
+            elif state == _TOMBSTONE:
+                yield ()
+            else:
+                yield keys[index], values[index], hashes[index]
+
+    def _restore_slots(self, slots) -> None:
+        """
+        Helper method for load() that takes (index, slot) pairs for the
+        non-empty slots of a snapshot, each an empty tuple for a tombstone
+        or (key, value, hash), and puts them back in place.
+        """
+        for index, slot in slots:
+            if slot:
+                self._states[index] = _LIVE
+                self._keys[index], self._values[index] = slot[0], slot[1]
+                self._hashes[index] = slot[2] & _MASK64
+            else:
+                self._states[index] = _TOMBSTONE
+
+    def _remove(self, key: str, hash: int) -> bool:
+        """
+        Helper method that turns the slot for a key into a tombstone, without
+        compacting the table. Returns True if the key was present.
+        """
+        index = self._get_index(key, hash)
+        if index < 0 or self._states[index] != _LIVE:
+            return False
+
+        self._states[index] = _TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+        return True
+
+    def _rehash(self, new_capacity: int) -> bool:
+        """
+        Helper method for resize_table() that moves every live slot into new
+        arrays in one linear pass, placing each by its stored hash. Returns
+        False, leaving the table untouched, if some entry cannot be placed
+        within the probe limit.
+        """
+        old_hashes, old_keys = self._hashes, self._keys
+        old_values, old_states = self._values, self._states
+        self._allocate(new_capacity)
+        hashes, keys = self._hashes, self._keys
+        values, states = self._values, self._states
+        reachable = self._reachable_for(new_capacity)
+        accel = self._probe_accel
+        longest = 1
+
+        for i in range(len(old_states)):
+            if old_states[i] != _LIVE:
+                continue
+            hash = old_hashes[i]
+            index = hash % new_capacity
+            delta = 1 + hash % (new_capacity - 1) if self._double_hashing else 1
+            probes = 1
+            while states[index] != _EMPTY:
+                if probes == reachable:
+                    self._hashes, self._keys = old_hashes, old_keys
+                    self._values, self._states = old_values, old_states
+                    return False
+                probes += 1
+                index = (index + delta) % new_capacity
+                delta += accel
+            states[index] = _LIVE
+            hashes[index] = hash
+            keys[index] = old_keys[i]
+            values[index] = old_values[i]
+            if probes > longest:
+                longest = probes
+
+        self._capacity = new_capacity
+        self._reachable = reachable
+        self._probe_limit = longest
+        self._tombstones = 0
+        return True
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key and returns the value stored with it, or None if the
+        key does not exist.
+        """
+        index = self._get_index(key, self._hash_function(key))
+        if index >= 0 and self._states[index] == _LIVE:
+            return self._values[index]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key and returns a boolean denoting whether it is a valid key
+        in the current hash table.
+        """
+        index = self._get_index(key, self._hash_function(key))
+        return index >= 0 and self._states[index] == _LIVE
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all valid keys for objects stored
+        in hash table.
+        """
+        states = self._states
+        return DynamicArray([key for i, key in enumerate(self._keys)
+                             if states[i] == _LIVE])
+
+    def _update(self, key: str, value: object, hash: int) -> bool:
+        """
+        Helper method that sets the value stored with key, if it is present,
+        by precomputed hash. Returns True if the key was present.
+        """
+        index = self._get_index(key, hash)
+        if index < 0 or self._states[index] != _LIVE:
+            return False
+        self._values[index] = value
+        return True
+
+    def _iter_items(self):
+        """
+        Helper method for the views that yields a (key, value) pair for
+        each live slot, in slot order, raising RuntimeError once the size
+        or slot arrays have changed since the first pair.
+        """
+        version, size = self._version, self._size
+        keys, values = self._keys, self._values
+        for index, state in enumerate(self._states):
+            if state == _LIVE:
+                yield keys[index], values[index]
+                if self._version != version or self._size != size:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        hash_function = self._hash_function
+        get_index = self._get_index
+        states, values = self._states, self._values
+        found = []
+        for key in to_list(keys):
+            index = get_index(key, hash_function(key))
+            found.append(values[index]
+                         if index >= 0 and states[index] == _LIVE else None)
+        return DynamicArray(found)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        hash_function = self._hash_function
+        get_index = self._get_index
+        states = self._states
+        found = []
+        for key in to_list(keys):
+            index = get_index(key, hash_function(key))
+            found.append(index >= 0 and states[index] == _LIVE)
+        return DynamicArray(found)
+
+    def _find_slot(self, key: str, hash: int) -> tuple:
+        """
+        Helper method for inserts that takes a key and its (masked) hash.
+        Returns the index of the key's slot, or if it is not found, of the
+        first tombstone or empty slot on its probe path, along with the
+        number of slots examined to get there. The index is -1 if no such
+        slot is reachable.
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        capacity = self._capacity
+        index = hash % capacity
+        delta = 1 + hash % (capacity - 1) if self._double_hashing else 1
+        accel = self._probe_accel
+        probes = 1
+        first_tombstone, tombstone_probes = -1, 0
+
+        state = states[index]
+        while state != _EMPTY:
+            if state == _LIVE:
+                if hashes[index] == hash and keys[index] == key:
+                    return index, probes
+            elif first_tombstone < 0:
+                first_tombstone, tombstone_probes = index, probes
+
+            if probes == self._reachable:
+                index = -1
+                break
+            probes += 1
+            index = (index + delta) % capacity
+            delta += accel
+            state = states[index]
+
+        if first_tombstone >= 0:
+            return first_tombstone, tombstone_probes
+        return index, probes
+
+    def _get_index(self, key: str, hash: int) -> int:
+        """
+        Helper method for lookups that takes a key and its hash. Returns the
+        index of the given key, or of the empty slot ending its probe path
+        if it is not found, or -1 once the probe sequence is longer than
+        that of any stored entry.
+        """
+        hash &= _MASK64
+        states, hashes, keys = self._states, self._hashes, self._keys
+        capacity = self._capacity
+        index = hash % capacity
+        delta = 1 + hash % (capacity - 1) if self._double_hashing else 1
+        accel = self._probe_accel
+        probes_left = self._probe_limit
+
+        state = states[index]
+        while state != _EMPTY:
+            if state == _LIVE and hashes[index] == hash and keys[index] == key:
+                break
+
+            probes_left -= 1
+            if probes_left == 0:
+                index = -1
+                break
+            index = (index + delta) % capacity
+            delta += accel
+            state = states[index]
+
+        if self._stats is not None:
+            self._stats.record_probes(
+                self._probe_limit - probes_left + (index >= 0))
+        return index
+
+
+class IncrementalHashMap(HashMap):
+    """
+    HashMap that resizes incrementally. A resize allocates the new bucket
+    array but leaves the entries where they are. Every later operation
+    moves the entries from a bounded number of old slots (migrate_step)
+    into the new array. Until the old array is drained, lookups and
+    removals consult both, so no single operation pays for a full rehash.
+    """
+
+    def __init__(self, capacity: int, function=None, max_load: float = 0.5,
+                 tombstone_ratio: float = 0.25, probing: str = 'quadratic',
+                 max_probes: int = None, seed: int = None,
+                 migrate_step: int = 8) -> None:
+        """
+        Initialize new HashMap as HashMap does, migrating migrate_step old
+        slots per operation while a resize is in progress.
+        """
+        super().__init__(capacity, function, max_load, tombstone_ratio,
+                         probing, max_probes, seed)
+        self._migrate_step = migrate_step
+        self._old = None
+        self._migrate_index = 0
+
+    def get_size(self) -> int:
+        """
+        Return size of map, counting entries not yet migrated
+        """
+        if self._old is None:
+            return self._size
+        return self._size + self._old._size
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets the current hash table will have
+        once any resize in progress finishes.
+        """
+        return self._capacity - self.get_size()
+
+    def is_resizing(self) -> bool:
+        """
+        Returns True while entries remain to be migrated to the new table.
+        """
+        return self._old is not None
+
+    def finish_resize(self) -> None:
+        """
+        Migrates every remaining entry, completing any resize in progress.
+        """
+        if self._old is not None:
+            self._migrate(self._old._capacity)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table.
+        """
+        self._migrate(self._migrate_step)
+        hash = self._hash_function(key)
+        old = self._old
+        if old is not None:
+            index = old._get_index(key, hash)
+            if index >= 0 and old._buckets[index] is not None:
+                old._buckets[index].value = value
+                return
+
+        # A resize moves every entry to the old table, so an existing key
+        # must be updated before growing, rather than inserted after
+        if self.occupied_load() >= self._max_load:
+            index = self._get_index(key, hash)
+            if index >= 0 and self._buckets[index] is not None:
+                self._buckets[index].value = value
+                return
+            self.resize_table(self._capacity * 2)
+        self._insert(key, value, hash)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string and returns the value stored with that string as key,
+        or None if key does not exist.
+        """
+        self._migrate(self._migrate_step)
+        table, index = self._locate(key, self._hash_function(key))
+        return table._buckets[index].value if index >= 0 else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string and returns a boolean denoting whether that string
+        is a valid key in the current hash table.
+        """
+        self._migrate(self._migrate_step)
+        return self._locate(key, self._hash_function(key))[1] >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key and removes the element with that key from the
+        hash table. If key is not found, does nothing.
+        """
+        self._migrate(self._migrate_step)
+        hash = self._hash_function(key)
+        if self._remove(key, hash):
+            if self._tombstones >= self._capacity * self._tombstone_ratio:
+                self.resize_table(self._capacity)
+        elif self._old is not None:
+            self._old._remove(key, hash)
+
+    def clear(self) -> None:
+        """
+        Removes all stored elements from the hash table, abandoning any
+        resize in progress, while retaining its current capacity.
+        """
+        self._old = None
+        super().clear()
+
+    def save(self, path: str) -> None:
+        """
+        Takes a path and writes the map to a binary snapshot file there, as
+        HashMap.save() does, after finishing any resize in progress.
+        """
+        self.finish_resize()
+        super().save(path)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all valid keys for
+        objects stored in hash table.
+        """
+        keys = super().get_keys()
+        if self._old is not None:
+            keys.as_list().extend(self._old.get_keys().as_list())
+        return keys
+
+    def _iter_items(self):
+        """
+        Helper method for the views that finishes any resize in progress,
+        so that lookups made while iterating cannot move entries, then
+        yields each pair as HashMap._iter_items() does.
+        """
+        self.finish_resize()
+        yield from super()._iter_items()
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would, one operation per pair.
+        """
+        for key, value in to_list(pairs):
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would, one operation per key.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer and starts resizing the hash table's capacity to
+        that number, rounded up as the probing strategy requires. Only the
+        new bucket array is allocated here; the entries follow a few at a
+        time. If a resize is already in progress, the new array (holding
+        just the entries migrated so far) is resized outright instead.
+        """
+        if self._old is not None:
+            super().resize_table(new_capacity)
+            return
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        start = time.perf_counter()
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size > new_capacity * self._max_load:
+            new_capacity = self._round_capacity(new_capacity * 2)
+
+        # The old table keeps its own buckets, size and probe bounds, so it
+        # can still be searched with the usual helpers
+        self._old = copy.copy(self)
+        self._migrate_index = 0
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        self._reachable = self._reachable_for(new_capacity)
+        self._probe_limit = 1
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+        self._resize_time = time.perf_counter() - start
+        if self._stats is not None:
+            self._stats.record_resize(self._resize_time)
+
+    def _locate(self, key: str, hash: int) -> tuple:
+        """
+        Helper method that returns the table (this map, or the old table
+        being migrated from) holding a live entry for key, and its index
+        there. The index is -1 if the key is in neither.
+        """
+        index = self._get_index(key, hash)
+        if index >= 0 and self._buckets[index] is not None:
+            return self, index
+        old = self._old
+        if old is not None:
+            index = old._get_index(key, hash)
+            if index >= 0 and old._buckets[index] is not None:
+                return old, index
+        return self, -1
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Helper method that moves an entry from the old table into the first
+        open slot for it, reusing the entry object. Keys in the old table
+        are never also in the new one, so no key comparison is needed.
+        """
+        index, probes = self._find_slot(entry.key, entry.hash)
+        if index < 0 or self._too_many_probes(probes):
+            self._insert(entry.key, entry.value, entry.hash)
+            return
+        slots = self._buckets.as_list()
+        if slots[index] is not None:
+            self._tombstones -= 1
+        slots[index] = entry
+        self._size += 1
+        if probes > self._probe_limit:
+            self._probe_limit = probes
+
+    def _migrate(self, count: int) -> None:
+        """
+        Helper method that moves the live entries in the next count slots
+        of the old table into the new one, and drops the old table once it
+        has been drained. Moved entries leave a tombstone behind, so the
+        old probe sequences stay intact.
+        """
+        old = self._old
+        if old is None:
+            return
+        slots = old._buckets.as_list()
+        end = min(self._migrate_index + count, old._capacity)
+        for index in range(self._migrate_index, end):
+            entry = slots[index]
+            if entry is not None and not entry.is_tombstone:
+                slots[index] = _MIGRATED
+                old._size -= 1
+                self._place(entry)
+        self._migrate_index = end
+        if end == old._capacity:
+            self._old = None
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -382,3 +1521,20 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    print("\nmax_load and tombstone_ratio must be in range")
+    print("---------------------------------------------")
+    for settings in ({'max_load': -1}, {'max_load': 0}, {'max_load': 1.5},
+                     {'tombstone_ratio': 0}, {'tombstone_ratio': 1}):
+        for cls in (HashMap, CompactHashMap):
+            try:
+                cls(5, hash_function_2, **settings)
+            except ValueError as error:
+                print(cls.__name__, error)
+            else:
+                raise AssertionError(settings)
+    m = HashMap(5, hash_function_2, max_load=1.0)
+    for i in range(5):
+        m.put(str(i), i)
+    m.resize_table(3)
+    print(m.get_size(), m.get_capacity())
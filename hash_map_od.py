@@ -0,0 +1,367 @@
+# Course: CS261 - Data Structures
+# Description: An implementation of a hash map modeled on CPython's compact dict.
+#              A small sparse table of integers indexes into dense,
+#              insertion-ordered arrays of hashes, keys and values, so
+#              iteration costs O(size) rather than O(capacity) and a resize
+#              only rebuilds the sparse table.
+
+
+from array import array
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2,
+                        keyed_function, to_list)
+
+
+# Special values stored in the sparse index table
+_FREE = -1
+_DUMMY = -2
+
+# Marks a deleted entry in the dense arrays
+_DELETED = object()
+
+_MASK64 = (1 << 64) - 1
+_PERTURB_SHIFT = 5
+_MIN_CAPACITY = 8
+
+
+def _index_typecode(capacity: int) -> str:
+    """
+    Returns the smallest signed array typecode able to hold every
+    index into dense arrays sized for the given capacity.
+    """
+    if capacity <= 1 << 7:
+        return 'b'
+    if capacity <= 1 << 15:
+        return 'h'
+    if capacity <= 1 << 31:
+        return 'i'
+    return 'q'
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=None, seed: int = None) -> None:
+        """
+        Initialize new HashMap with a sparse index table of at least the
+        given capacity, rounded up to a power of two. If function is None,
+        keys are hashed with a KeyedHash using seed, or a random seed.
+        """
+        self._hash_function = keyed_function(function, seed)
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+        self._size = 0
+        # Index slots left behind by removals, and removed entries still
+        # in the dense arrays. These differ once _append() reuses a slot.
+        self._dummies = 0
+        self._deleted = 0
+        self._allocate(self._round_capacity(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output: one line per
+        slot of the index table, showing the entry it points to.
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = self._indices[i]
+            if entry < 0:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[entry]) + ' V: '
+                        + str(self._values[entry]) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (the number of slots in its index table)
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table. A new key is
+        appended to the end of the insertion order; an existing key keeps its
+        position and has its value updated.
+        """
+        hash = self._hash_function(key) & _MASK64
+        slot = self._find_slot(key, hash)
+        if slot >= 0:
+            self._values[self._indices[slot]] = value
+            return
+
+        # Grow (or compact away deleted entries) once the dense arrays fill up
+        if len(self._keys) >= self._usable():
+            self._resize(self._size * 3)
+        self._append(key, value, hash)
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the current hash table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of index slots not pointing at a live entry.
+        """
+        return self._capacity - self._size
+
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of index slots left behind by removed entries.
+        """
+        return self._dummies
+
+    def occupied_load(self) -> float:
+        """
+        Returns the fraction of index slots that are not free, counting both
+        live entries and slots left behind by removals.
+        """
+        return (self._size + self._dummies) / self._capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer and resizes the index table to at least that many
+        slots, rounded up to a power of two with room for every entry. The
+        dense arrays are only compacted, never rehashed.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        self._resize(new_capacity)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key and returns the value stored with it, or None if the
+        key does not exist.
+        """
+        slot = self._find_slot(key, self._hash_function(key) & _MASK64)
+        if slot < 0:
+            return None
+        return self._values[self._indices[slot]]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key and returns a boolean denoting whether it is a valid key
+        in the current hash table.
+        """
+        return self._find_slot(key, self._hash_function(key) & _MASK64) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key and removes the element with that key from the hash
+        table. If key is not found, does nothing.
+        """
+        slot = self._find_slot(key, self._hash_function(key) & _MASK64)
+        if slot < 0:
+            return
+
+        entry = self._indices[slot]
+        self._indices[slot] = _DUMMY
+        self._keys[entry] = _DELETED
+        self._values[entry] = None
+        self._size -= 1
+        self._dummies += 1
+        self._deleted += 1
+
+    def clear(self) -> None:
+        """
+        Removes all stored elements from the hash table, while retaining
+        its current capacity.
+        """
+        self._allocate(self._capacity)
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._dummies = 0
+        self._deleted = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all keys stored in the hash table,
+        in insertion order.
+        """
+        if self._deleted == 0:
+            return DynamicArray(self._keys)
+        return DynamicArray([key for key in self._keys if key is not _DELETED])
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would, resizing at most once up front.
+        """
+        pairs = to_list(pairs)
+        if len(self._keys) + len(pairs) >= self._usable():
+            self._resize((self._size + len(pairs)) * 3)
+
+        hash_function = self._hash_function
+        for key, value in pairs:
+            hash = hash_function(key) & _MASK64
+            slot = self._find_slot(key, hash)
+            if slot >= 0:
+                self._values[self._indices[slot]] = value
+            else:
+                self._append(key, value, hash)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def _usable(self) -> int:
+        """
+        Helper method returning how many dense entries (live or deleted) the
+        index table can address before it must grow: two thirds of its slots,
+        which guarantees every probe sequence reaches a free slot.
+        """
+        return self._capacity * 2 // 3
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method returning the smallest power of two that is at least
+        the given capacity and leaves room for every live entry.
+        """
+        new_capacity = _MIN_CAPACITY
+        while new_capacity < capacity or new_capacity * 2 // 3 <= self._size:
+            new_capacity *= 2
+        return new_capacity
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that replaces the index table with a free one.
+        """
+        self._indices = array(_index_typecode(capacity), [_FREE]) * capacity
+        self._capacity = capacity
+
+    def _resize(self, capacity: int) -> None:
+        """
+        Helper method that drops deleted entries from the dense arrays and
+        rebuilds the index table with at least the given number of slots.
+        """
+        if self._deleted:
+            live = [i for i, key in enumerate(self._keys) if key is not _DELETED]
+            self._hashes = array('Q', [self._hashes[i] for i in live])
+            self._keys = [self._keys[i] for i in live]
+            self._values = [self._values[i] for i in live]
+            self._deleted = 0
+
+        self._allocate(self._round_capacity(capacity))
+        self._dummies = 0
+        for entry, hash in enumerate(self._hashes):
+            self._indices[self._free_slot(hash)] = entry
+
+    def _append(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper method that adds a new key to the end of the dense arrays and
+        points a free index slot at it. The caller ensures there is room.
+        """
+        slot = self._free_slot(hash)
+        if self._indices[slot] == _DUMMY:
+            self._dummies -= 1
+        self._indices[slot] = len(self._keys)
+        self._hashes.append(hash)
+        self._keys.append(key)
+        self._values.append(value)
+        self._size += 1
+
+    def _find_slot(self, key: str, hash: int) -> int:
+        """
+        Helper method that takes a key and its hash, and returns the index
+        table slot pointing at that key, or -1 if it is not present.
+        """
+        indices, hashes, keys = self._indices, self._hashes, self._keys
+        mask = self._capacity - 1
+        perturb = hash
+        slot = hash & mask
+
+        entry = indices[slot]
+        while entry != _FREE:
+            if entry >= 0 and hashes[entry] == hash and keys[entry] == key:
+                return slot
+            # Mix in higher bits of the hash, as CPython's dict does
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+            entry = indices[slot]
+        return -1
+
+    def _free_slot(self, hash: int) -> int:
+        """
+        Helper method that returns the first free (or previously used) slot
+        on the probe sequence for a hash.
+        """
+        indices = self._indices
+        mask = self._capacity - 1
+        perturb = hash
+        slot = hash & mask
+
+        while indices[slot] >= 0:
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+        return slot
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput and get_keys (insertion order)")
+    print("----------------------------------")
+    m = HashMap(8, hash_function_1)
+    for i in range(20):
+        m.put('str' + str(i), i * 100)
+    m.remove('str3')
+    m.put('str0', -1)
+    print(m.get_size(), m.get_capacity(), m.get('str0'), m.contains_key('str3'))
+    print(m.get_keys())
+
+    print("\nresize_table")
+    print("------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nget_keys after a removed slot is reused")
+    print("---------------------------------------")
+    m = HashMap(8, lambda key: 0)
+    m.put('a', 1)
+    m.put('b', 2)
+    m.remove('a')
+    m.put('c', 3)
+    print(m.get_keys(), m.get_tombstone_count())
+    assert m.get_keys().as_list() == ['b', 'c']
+    m.resize_table(8)
+    print(m.get_keys(), len(m._keys))
+    assert len(m._keys) == 2
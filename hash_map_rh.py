@@ -0,0 +1,415 @@
+# Course: CS261 - Data Structures
+# Description: An implementation of a hash map using Robin Hood hashing: linear
+#              probing in which an entry that has travelled further from its
+#              home slot takes the place of one that has travelled less.
+#              Removal shifts the following entries back rather than leaving
+#              tombstones, and lookups for missing keys stop early.
+
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2,
+                        keyed_function, to_list)
+
+
+_MASK64 = (1 << 64) - 1
+
+# Probe distance stored in empty slots
+_EMPTY = -1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=None, max_load: float = 0.9,
+                 seed: int = None) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood hashing for collision
+        resolution. The capacity is rounded up to a power of two, and the
+        table doubles once its load would exceed max_load. If function is
+        None, keys are hashed with a KeyedHash using seed, or a random seed.
+        max_load must be greater than 0 and at most 1.
+        """
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be greater than 0 and at most 1")
+        self._hash_function = keyed_function(function, seed)
+        self._max_load = max_load
+        self._size = 0
+        self._allocate(self._round_capacity(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output, including
+        each entry's distance from its home slot.
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._dists[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: '
+                        + str(self._values[i]) + ' D: ' + str(self._dists[i])
+                        + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table, or updates
+        the value if the key is already present.
+        """
+        hash = self._hash_function(key) & _MASK64
+        # An existing key is updated in place first, so that changing a
+        # value never moves entries (which would break iteration over the map)
+        if self._size + 1 > self._capacity * self._max_load:
+            if self._update(key, value, hash):
+                return
+            self.resize_table(self._capacity * 2)
+        self._insert(key, value, hash)
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the current hash table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the current hash table.
+        """
+        return self._capacity - self._size
+
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of tombstones, which is always zero: removal
+        shifts entries back instead of leaving tombstones behind.
+        """
+        return 0
+
+    def occupied_load(self) -> float:
+        """
+        Returns the fraction of buckets that are not empty. With no
+        tombstones, this is the same as table_load().
+        """
+        return self.table_load()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer and resizes the hash table's capacity to at least
+        that number, rounded up to a power of two that keeps the load under
+        max_load.
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size > new_capacity * self._max_load:
+            new_capacity *= 2
+
+        old_keys, old_values = self._keys, self._values
+        old_hashes, old_dists = self._hashes, self._dists
+        self._allocate(new_capacity)
+        self._size = 0
+        for i in range(len(old_dists)):
+            if old_dists[i] != _EMPTY:
+                self._insert(old_keys[i], old_values[i], old_hashes[i])
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key and returns the value stored with it, or None if the
+        key does not exist.
+        """
+        index = self._get_index(key, self._hash_function(key) & _MASK64)
+        if index < 0:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key and returns a boolean denoting whether it is a valid key
+        in the current hash table.
+        """
+        return self._get_index(key, self._hash_function(key) & _MASK64) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key and removes the element with that key from the hash
+        table, shifting the entries after it back towards their home slots.
+        If key is not found, does nothing.
+        """
+        index = self._get_index(key, self._hash_function(key) & _MASK64)
+        if index < 0:
+            return
+
+        keys, values = self._keys, self._values
+        hashes, dists = self._hashes, self._dists
+        mask = self._capacity - 1
+
+        # Backward-shift deletion: pull each following entry back one slot
+        # until reaching an empty slot or an entry already in its home slot
+        next_index = (index + 1) & mask
+        while dists[next_index] > 0:
+            keys[index] = keys[next_index]
+            values[index] = values[next_index]
+            hashes[index] = hashes[next_index]
+            dists[index] = dists[next_index] - 1
+            index, next_index = next_index, (next_index + 1) & mask
+
+        keys[index] = None
+        values[index] = None
+        dists[index] = _EMPTY
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Removes all stored elements from the hash table, while retaining
+        its current capacity.
+        """
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray containing all keys stored in the hash table.
+        """
+        dists = self._dists
+        return DynamicArray([key for i, key in enumerate(self._keys)
+                             if dists[i] != _EMPTY])
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would, resizing at most once up front.
+        """
+        hash_function = self._hash_function
+        pairs = [(key, value, hash_function(key) & _MASK64)
+                 for key, value in to_list(pairs)]
+
+        # Size the table for the keys not yet stored, counting a key that
+        # appears more than once in the batch only once. resize_table() only
+        # keeps the current entries under max_load, so pick a capacity that
+        # has room for the new keys as well
+        new_keys = {key for key, _, hash in pairs
+                    if self._get_index(key, hash) < 0}
+        count = self._size + len(new_keys)
+        if count > self._capacity * self._max_load:
+            new_capacity = self._capacity * 2
+            while count > new_capacity * self._max_load:
+                new_capacity *= 2
+            self.resize_table(new_capacity)
+
+        for key, value, hash in pairs:
+            self._insert(key, value, hash)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that rounds a capacity up to a power of two, so that
+        indices can wrap around with a bit mask.
+        """
+        return 1 << max(0, capacity - 1).bit_length()
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that replaces the slot arrays with empty ones of the
+        given capacity.
+        """
+        self._capacity = capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._dists = [_EMPTY] * capacity
+
+    def _insert(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper method that stores a key-value pair by (masked) hash, without
+        checking whether the table needs to grow. Walking from the key's home
+        slot, the entry being placed swaps with any entry closer to its own
+        home slot, and carries on placing that one instead.
+        """
+        keys, values = self._keys, self._values
+        hashes, dists = self._hashes, self._dists
+        mask = self._capacity - 1
+        index = hash & mask
+        dist = 0
+
+        while True:
+            slot_dist = dists[index]
+            if slot_dist == _EMPTY:
+                keys[index], values[index] = key, value
+                hashes[index], dists[index] = hash, dist
+                self._size += 1
+                return
+
+            if slot_dist == dist and hashes[index] == hash and keys[index] == key:
+                values[index] = value
+                return
+
+            # The resident entry is "richer" (closer to home): displace it.
+            # The key being placed cannot be further on, so it is new.
+            if slot_dist < dist:
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                hashes[index], hash = hash, hashes[index]
+                dists[index], dist = dist, slot_dist
+                self._size += 1
+                self._place(key, value, hash, dist, (index + 1) & mask)
+                return
+
+            index = (index + 1) & mask
+            dist += 1
+
+    def _place(self, key: str, value: object, hash: int, dist: int,
+               index: int) -> None:
+        """
+        Helper method that finishes an insertion by carrying a displaced
+        entry forward from the given slot, displacing richer entries in
+        turn, until it reaches an empty slot.
+        """
+        keys, values = self._keys, self._values
+        hashes, dists = self._hashes, self._dists
+        mask = self._capacity - 1
+        dist += 1
+
+        while dists[index] != _EMPTY:
+            if dists[index] < dist:
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                hashes[index], hash = hash, hashes[index]
+                dists[index], dist = dist, dists[index]
+            index = (index + 1) & mask
+            dist += 1
+
+        keys[index], values[index] = key, value
+        hashes[index], dists[index] = hash, dist
+
+    def _update(self, key: str, value: object, hash: int) -> bool:
+        """
+        Helper method that sets the value stored with key, if it is present,
+        by (masked) hash. Returns True if the key was present.
+        """
+        index = self._get_index(key, hash)
+        if index < 0:
+            return False
+        self._values[index] = value
+        return True
+
+    def _get_index(self, key: str, hash: int) -> int:
+        """
+        Helper method that takes a key and its (masked) hash, and returns the
+        index of its slot or -1 if it is not present. The search stops as
+        soon as it reaches an entry closer to its home slot than the key
+        would be, since the key would have displaced that entry.
+        """
+        keys, hashes, dists = self._keys, self._hashes, self._dists
+        mask = self._capacity - 1
+        index = hash & mask
+        dist = 0
+
+        while dists[index] >= dist:
+            if dists[index] == dist and hashes[index] == hash and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+            dist += 1
+        return -1
+
+    def _probe_length(self, key: str) -> int:
+        """
+        Helper method returning the number of slots a lookup for the given
+        key examines, whether or not the key is present.
+        """
+        hash = self._hash_function(key) & _MASK64
+        dists = self._dists
+        mask = self._capacity - 1
+        index = hash & mask
+        dist = 0
+
+        while dists[index] >= dist:
+            if (dists[index] == dist and self._hashes[index] == hash
+                    and self._keys[index] == key):
+                break
+            index = (index + 1) & mask
+            dist += 1
+        return dist + 1
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove")
+    print("-------------------")
+    m = HashMap(8, hash_function_1)
+    for i in range(12):
+        m.put('str' + str(i), i * 100)
+    m.remove('str3')
+    print(m.get_size(), m.get_capacity(), m.get('str4'), m.contains_key('str3'))
+    print(m)
+
+    print("\nresize_table")
+    print("------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nput_many stays under max_load")
+    print("-----------------------------")
+    m = HashMap(8, hash_function_2)
+    m.put_many(DynamicArray([('str' + str(i), i) for i in range(1024)]))
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    assert m.table_load() <= 0.9
+
+    print("\nupdates at max_load do not grow the table")
+    print("-----------------------------------------")
+    m = HashMap(16, hash_function_2, max_load=0.5)
+    for i in range(8):
+        m.put(str(i), i)
+    m.put('0', 9)
+    m.put_many(DynamicArray([(str(i), i * 10) for i in range(8)]))
+    print(m.get_size(), m.get_capacity(), m.get('0'), m.get('7'))
+    assert m.get_capacity() == 16
+    m.put_many(DynamicArray([('8', 8), ('8', 80), ('0', 0)]))
+    print(m.get_size(), m.get_capacity(), m.get('8'))
+    assert m.get_capacity() == 32 and m.table_load() <= 0.5
+    try:
+        HashMap(5, hash_function_2, max_load=0)
+    except ValueError as error:
+        print(error)
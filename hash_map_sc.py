@@ -7,24 +7,65 @@
 #              Includes additional method to find the mode of a given hash map. 
 
 
-from a6_include import (DynamicArray, LinkedList, SLNode,
-                        hash_function_1, hash_function_2)
+import heapq
+import marshal
+import time
+from itertools import repeat
+
+from a6_include import (DynamicArray, LinkedList, MapStats, MapView, SLNode,
+                        SortedChain,
+                        hash_function_1, hash_function_2,
+                        hash_function_from_id, keyed_function,
+                        matches_hash_function, next_prime,
+                        read_snapshot_header, to_list,
+                        write_snapshot_header)
+
+
+# Chains longer than this are converted to a SortedChain, and converted back
+# to a LinkedList once they shrink to UNTREEIFY_THRESHOLD. The gap between the
+# two keeps a chain near the limit from converting back and forth.
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function=None, max_load: float = 1.0,
+                 min_load: float = 0.25, seed: int = None) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        The table grows once its load exceeds max_load and shrinks once it
+        drops below min_load, never going below the initial capacity.
+        min_load must be at most a quarter of max_load, so a resize in
+        either direction lands well clear of the opposite watermark.
+        If function is None, keys are hashed with a KeyedHash using seed, or
+        a random seed if none is given.
         """
+        if min_load * 4 > max_load:
+            raise ValueError("min_load must be at most max_load / 4")
+
         self._buckets = DynamicArray()
         for _ in range(capacity):
             self._buckets.append(LinkedList())
 
         self._capacity = capacity
-        self._hash_function = function
+        self._hash_function = keyed_function(function, seed)
         self._size = 0
+        self._max_load = max_load
+        self._min_load = min_load
+        self._min_capacity = capacity
+        self._stats = None
+
+        # The number of buckets holding chains of each length, indexed by
+        # length, without trailing zeros: the last index is the longest
+        # chain. Kept up to date by every insert and removal, along with
+        # the number of chains stored as a SortedChain.
+        self._chain_counts = [capacity]
+        self._sorted_chains = 0
+
+        # Bumped whenever the bucket array is rebuilt (by a resize or
+        # clear), so iterators can tell their chains are stale
+        self._version = 0
 
     def __str__(self) -> str:
         """
@@ -36,6 +77,24 @@ class HashMap:
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
         return out
 
+    def __iter__(self):
+        """
+        Return an iterator over the keys in the map (see keys()).
+        """
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        """
+        Return size of map, so that len() works on it
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return whether key is in the map, so that the in operator works on it
+        """
+        return self.contains_key(key)
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -57,30 +116,33 @@ class HashMap:
         Takes a key-value pair and stores it in the hash table. If an
         element already exists with that key, updates its value instead.
         """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        bucket = self._buckets[index]
+        # Update value with provided key, if already exists
+        node = bucket.contains(key, hash)
+        if node is not None:
+            node.value = value
+            return
 
-        bucket = self._get_bucket(key)
-        for node in bucket: 
-            # Update value with provided key, if already exists
-            if node.key == key:
-                node.value = value
-                return
-        
         # If not, add this value to the list and increment size 
-        bucket.insert(key, value)
+        bucket.insert(key, value, hash)
         self._size += 1
+        length = bucket.length()
+        self._count_chain(length - 1, length)
+        if length > TREEIFY_THRESHOLD:
+            self._fit_chain(index)
+
+        # Grow to the next prime past double capacity once load gets too high
+        if self._size > self._capacity * self._max_load:
+            self.resize_table(next_prime(self._capacity * 2))
 
     def empty_buckets(self) -> int:
         """
         Returns the number of buckets in the current hash table which
         contain no elements. 
         """
-        empty_count = 0
-
-        for i in range(self._buckets.length()):
-            if self._buckets[i].length() == 0:
-                empty_count += 1
-        
-        return empty_count
+        return self._chain_counts[0]
         
     def table_load(self) -> float:
         """
@@ -88,16 +150,34 @@ class HashMap:
         """
         return self._size / self._capacity
 
+    def get_longest_chain(self) -> int:
+        """
+        Returns the number of elements in the longest chain of the current
+        hash table.
+        """
+        return len(self._chain_counts) - 1
+
     def clear(self) -> None:
         """
         Empties the current hash table of its contents, while
-        preserving its capacity. 
+        preserving its capacity. Only the chains holding elements are
+        replaced, and the scan for them stops once the last is found.
         """
-        self._size = 0
-        self._buckets = DynamicArray()
+        # The chain counts say how many buckets are not empty
+        remaining = self._capacity - self._chain_counts[0]
+        if remaining:
+            slots = self._buckets.as_list()
+            for index, bucket in enumerate(slots):
+                if bucket.length():
+                    slots[index] = LinkedList()
+                    remaining -= 1
+                    if not remaining:
+                        break
 
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        self._size = 0
+        self._chain_counts = [self._capacity]
+        self._sorted_chains = 0
+        self._version += 1
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -106,53 +186,137 @@ class HashMap:
         """
         if new_capacity < 1: 
             return
+        start = time.perf_counter()
         
         # Instantiate new bucket list with provided capacity, fill with empty lists
         old_buckets = self._buckets
         self._buckets = DynamicArray()
         self._capacity = new_capacity
         self._size = 0
+        self._version += 1
         for _ in range(new_capacity):
             self._buckets.append(LinkedList())
         
-        # Iterate over old elements and hash/place in new list
+        # Iterate over old elements and place them in new list by their
+        # cached hashes. Keys are already unique, so insert directly rather
+        # than going through put()
         for i in range(old_buckets.length()):
             for node in old_buckets[i]:
-                self.put(node.key, node.value)
+                self._buckets[node.hash % new_capacity].insert(
+                    node.key, node.value, node.hash)
+                self._size += 1
+
+        # Convert long chains, counting the chains of each length on the way
+        counts = [0]
+        self._sorted_chains = 0
+        for index, bucket in enumerate(self._buckets.as_list()):
+            length = bucket.length()
+            if length > TREEIFY_THRESHOLD:
+                self._fit_chain(index)
+            while length >= len(counts):
+                counts.append(0)
+            counts[length] += 1
+        self._chain_counts = counts
+
+        if self._stats is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def enable_stats(self) -> None:
+        """
+        Starts recording statistics: the length of the chain searched by
+        each lookup, the number and duration of resizes, and calls to the
+        hash function and the time spent in them. Until this is called,
+        the map records nothing.
+        """
+        if self._stats is None:
+            self._stats = MapStats()
+            self._hash_function = self._stats.timed(self._hash_function)
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording statistics and discards those recorded so far.
+        """
+        if self._stats is not None:
+            self._hash_function = self._hash_function.__wrapped__
+            self._stats = None
+
+    def reset_stats(self) -> None:
+        """
+        Sets the recorded statistics back to zero, if they are enabled.
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def get_stats(self) -> dict:
+        """
+        Returns a snapshot of the map's statistics as a dict of plain
+        values: its size, capacity, load, empty buckets, longest chain,
+        number of chains stored as a SortedChain and a histogram of chain
+        lengths (from length to number of non-empty buckets), plus, while
+        statistics are enabled, the counters described in enable_stats()
+        (see a6_include.MapStats.snapshot(), where probes are chain
+        lengths). Bucket figures describe the current bucket array, which
+        during an incremental resize is the one being migrated to.
+        """
+        counts = self._chain_counts
+        stats = {
+            'enabled': self._stats is not None,
+            'size': self.get_size(),
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': counts[0],
+            'longest_chain': len(counts) - 1,
+            'sorted_chains': self._sorted_chains,
+            'chain_histogram': {length: counts[length]
+                                for length in range(1, len(counts))
+                                if counts[length]},
+        }
+        if self._stats is not None:
+            stats.update(self._stats.snapshot())
+        return stats
 
     def get(self, key: str) -> object:
         """
         Returns the stored value associated with a given key. If value
         is not present, returns None. 
         """
-        bucket = self._get_bucket(key)
-        for node in bucket:
-            if node.key == key:
-                return node.value
-        
+        hash = self._hash_function(key)
+        node = self._get_bucket(hash).contains(key, hash)
+        if node is not None:
+            return node.value
+
         return None
 
     def contains_key(self, key: str) -> bool:
         """
         Returns True if given key is present in hash map, False otherwise.
         """
-        bucket = self._get_bucket(key)
-        for node in bucket: 
-            if node.key == key:
-                return True
-        
-        return False
+        hash = self._hash_function(key)
+        return self._get_bucket(hash).contains(key, hash) is not None
 
     def remove(self, key: str) -> None:
         """
         Removes given key (and associated value) from hash map. If the key
         is not present in the map, does nothing. 
         """
-        bucket = self._get_bucket(key)
-        removed = bucket.remove(key)
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        bucket = self._buckets[index]
+        removed = bucket.remove(key, hash)
 
         if removed:
             self._size -= 1
+            length = bucket.length()
+            self._count_chain(length + 1, length)
+            if (isinstance(bucket, SortedChain)
+                    and bucket.length() <= UNTREEIFY_THRESHOLD):
+                self._fit_chain(index)
+
+            # Shrink after mass removals, but not below the initial capacity
+            if (self._capacity > self._min_capacity
+                    and self._size < self._capacity * self._min_load):
+                self.resize_table(max(self._min_capacity,
+                                      next_prime(self._capacity // 2)))
 
     def get_keys(self) -> DynamicArray:
         """
@@ -165,49 +329,812 @@ class HashMap:
         
         return keys
 
-    def _get_bucket(self, key: str) -> LinkedList:
+    def keys(self) -> MapView:
+        """
+        Returns a view of the keys in hash map, which streams them from the
+        chains when iterated, instead of copying them as get_keys() does.
+        Iteration raises RuntimeError if the map gains or loses keys, or is
+        resized, before it finishes.
+        """
+        return MapView(self, 'keys')
+
+    def values(self) -> MapView:
+        """
+        Returns a view of the values in hash map, in the same order as
+        keys().
+        """
+        return MapView(self, 'values')
+
+    def items(self) -> MapView:
+        """
+        Returns a view of the (key, value) pairs in hash map, in the same
+        order as keys().
+        """
+        return MapView(self, 'items')
+
+    def _iter_items(self):
+        """
+        Helper method for the views that yields a (key, value) pair for
+        each node, bucket by bucket, raising RuntimeError once the size or
+        bucket array has changed since the first pair.
+        """
+        version, size = self._version, self._size
+        for bucket in self._buckets.as_list():
+            for node in bucket:
+                yield node.key, node.value
+                if self._version != version or self._size != size:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would. The table is resized at most once, up
+        front, to make room for the whole batch.
+        """
+        pairs = to_list(pairs)
+        hash_function = self._hash_function
+        hashes = [hash_function(pair[0]) for pair in pairs]
+
+        # Size the table for the worst case, where every key is new
+        new_capacity = self._capacity
+        while self._size + len(pairs) > new_capacity * self._max_load:
+            new_capacity = next_prime(new_capacity * 2)
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+        buckets = self._buckets.as_list()
+        capacity = self._capacity
+        for (key, value), hash in zip(pairs, hashes):
+            index = hash % capacity
+            bucket = buckets[index]
+            node = bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+            else:
+                bucket.insert(key, value, hash)
+                self._size += 1
+                length = bucket.length()
+                self._count_chain(length - 1, length)
+                if length > TREEIFY_THRESHOLD:
+                    self._fit_chain(index)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        hash_function = self._hash_function
+        buckets = self._buckets.as_list()
+        capacity = self._capacity
+        record = self._stats.record_probes if self._stats is not None else None
+        values = []
+        for key in to_list(keys):
+            hash = hash_function(key)
+            bucket = buckets[hash % capacity]
+            if record is not None:
+                record(bucket.length())
+            node = bucket.contains(key, hash)
+            values.append(None if node is None else node.value)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        hash_function = self._hash_function
+        buckets = self._buckets.as_list()
+        capacity = self._capacity
+        record = self._stats.record_probes if self._stats is not None else None
+        found = []
+        for key in to_list(keys):
+            hash = hash_function(key)
+            bucket = buckets[hash % capacity]
+            if record is not None:
+                record(bucket.length())
+            found.append(bucket.contains(key, hash) is not None)
+        return DynamicArray(found)
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would, shrinking the table at most once at the end.
+        """
+        hash_function = self._hash_function
+        buckets = self._buckets.as_list()
+        capacity = self._capacity
+        for key in to_list(keys):
+            hash = hash_function(key)
+            index = hash % capacity
+            bucket = buckets[index]
+            if bucket.remove(key, hash):
+                self._size -= 1
+                length = bucket.length()
+                self._count_chain(length + 1, length)
+                if (isinstance(bucket, SortedChain)
+                        and bucket.length() <= UNTREEIFY_THRESHOLD):
+                    self._fit_chain(index)
+
+        # Halve until the load is high enough, stopping early once halving
+        # no longer gives a smaller prime (next_prime never goes below 2)
+        new_capacity = self._capacity
+        while (new_capacity > self._min_capacity
+               and self._size < new_capacity * self._min_load):
+            smaller = max(self._min_capacity, next_prime(new_capacity // 2))
+            if smaller >= new_capacity:
+                break
+            new_capacity = smaller
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+    def save(self, path: str) -> None:
+        """
+        Takes a path and writes the map to a binary snapshot file there,
+        recording its capacity, settings, hash function and the contents of
+        each bucket in order. Chains are written one at a time, so saving
+        needs no copy of the table. Keys and values must be types marshal
+        can store.
+        """
+        settings = {
+            'capacity': self._capacity,
+            'size': self._size,
+            'max_load': self._max_load,
+            'min_load': self._min_load,
+            'min_capacity': self._min_capacity,
+        }
+        with open(path, 'wb') as file:
+            write_snapshot_header(file, 'sc', self._hash_function, settings)
+
+            # Runs of empty buckets are written as a count, and every other
+            # bucket as its (key, value, hash) tuples: in a list for a
+            # LinkedList, and in a tuple for a SortedChain
+            empty = 0
+            for index in range(self._capacity):
+                bucket = self._buckets[index]
+                if bucket.length() == 0:
+                    empty += 1
+                    continue
+                if empty:
+                    marshal.dump(empty, file)
+                    empty = 0
+                chain = [(node.key, node.value, node.hash) for node in bucket]
+                if isinstance(bucket, SortedChain):
+                    chain = tuple(chain)
+                marshal.dump(chain, file)
+            if empty:
+                marshal.dump(empty, file)
+
+    @classmethod
+    def load(cls, path: str, function=None) -> "HashMap":
+        """
+        Takes the path of a snapshot written by save() and returns a new map
+        holding its contents. The hash function defaults to the one recorded
+        in the snapshot. When it is that function, each chain is restored
+        to its saved bucket, without rehashing. Otherwise each entry is put()
+        again. A snapshot of a map whose hash function could not be recorded
+        (see a6_include.hash_function_id) needs function to be given.
+        """
+        with open(path, 'rb') as file:
+            identity, settings = read_snapshot_header(file, 'sc')
+            if function is None:
+                if identity is None:
+                    raise ValueError("snapshot does not record its hash "
+                                     "function; pass one to load()")
+                function = hash_function_from_id(*identity)
+
+            capacity = settings['capacity']
+            map = cls(capacity, function, settings['max_load'],
+                      settings['min_load'])
+            map._min_capacity = settings['min_capacity']
+            restore = matches_hash_function(function, identity)
+
+            index = 0
+            while index < capacity:
+                item = marshal.load(file)
+                if type(item) is int:
+                    index += item
+                    continue
+                if restore:
+                    # Insert at the head in reverse, to keep the saved order
+                    bucket = map._buckets[index]
+                    for key, value, hash in reversed(item):
+                        bucket.insert(key, value, hash)
+                    if type(item) is tuple:
+                        map._buckets[index] = SortedChain(bucket)
+                else:
+                    for key, value, hash in item:
+                        map.put(key, value)
+                index += 1
+            if restore:
+                map._size = settings['size']
+                map._recount_chains()
+        return map
+
+    def _get_bucket(self, hash: int) -> LinkedList:
         """
-        Helper method to locate the "bucket" (LinkedList) associated with a 
-        given hashed index. 
+        Helper method to locate the "bucket" (LinkedList, or SortedChain for
+        a long chain) associated with a given hash value.
         """
-        index = self._hash_function(key) % self._capacity
+        index = hash % self._capacity
         bucket = self._buckets[index]
+        if self._stats is not None:
+            self._stats.record_probes(bucket.length())
+        return bucket
+
+    def _fit_chain(self, index: int) -> None:
+        """
+        Helper method that converts the chain at the given index to a
+        SortedChain once it is longer than TREEIFY_THRESHOLD, and back to a
+        LinkedList once it is no longer than UNTREEIFY_THRESHOLD.
+        """
+        bucket = self._buckets[index]
+        if bucket.length() > TREEIFY_THRESHOLD:
+            if isinstance(bucket, LinkedList):
+                self._buckets[index] = SortedChain(bucket)
+                self._sorted_chains += 1
+        elif (bucket.length() <= UNTREEIFY_THRESHOLD
+                and isinstance(bucket, SortedChain)):
+            chain = LinkedList()
+            for node in bucket:
+                chain.insert(node.key, node.value, node.hash)
+            self._buckets[index] = chain
+            self._sorted_chains -= 1
+
+    def _count_chain(self, old_length: int, new_length: int) -> None:
+        """
+        Helper method that updates the chain length counts after a chain
+        has gone from old_length to new_length elements.
+        """
+        counts = self._chain_counts
+        counts[old_length] -= 1
+        if new_length == len(counts):
+            counts.append(1)
+        else:
+            counts[new_length] += 1
+        if counts[-1] == 0:
+            counts.pop()
+
+    def _recount_chains(self) -> None:
+        """
+        Helper method that recomputes the chain length counts, and the
+        number of SortedChains, from every bucket.
+        """
+        counts = [0]
+        sorted_chains = 0
+        for bucket in self._buckets.as_list():
+            length = bucket.length()
+            while length >= len(counts):
+                counts.append(0)
+            counts[length] += 1
+            if isinstance(bucket, SortedChain):
+                sorted_chains += 1
+        self._chain_counts = counts
+        self._sorted_chains = sorted_chains
+
+
+class IncrementalHashMap(HashMap):
+    """
+    HashMap that resizes incrementally. A resize allocates the new bucket
+    array but leaves the chains where they are. Every later operation
+    moves a bounded number of old chains (migrate_step) into the new array.
+    Until the old array is drained, lookups and removals consult both, so
+    no single operation pays for a full rehash. The new array starts out
+    without chains: each is created when first used, and the rest in
+    proportion to the migration, so none is missing once it finishes.
+    """
+
+    def __init__(self, capacity: int, function=None, max_load: float = 1.0,
+                 min_load: float = 0.25, seed: int = None,
+                 migrate_step: int = 4) -> None:
+        """
+        Initialize new HashMap as HashMap does, migrating migrate_step old
+        chains per operation while a resize is in progress.
+        """
+        super().__init__(capacity, function, max_load, min_load, seed)
+        self._migrate_step = migrate_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # While resizing: the number of new buckets up to which every chain
+        # has been created, and of old chains not yet migrated that are empty
+        self._filled = capacity
+        self._old_empty = 0
+
+    def is_resizing(self) -> bool:
+        """
+        Returns True while chains remain to be migrated to the new table.
+        """
+        return self._old_buckets is not None
+
+    def finish_resize(self) -> None:
+        """
+        Migrates every remaining chain, completing any resize in progress.
+        """
+        self._migrate(self._old_capacity)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the hash table. If an
+        element already exists with that key, updates its value instead.
+        """
+        self._migrate(self._migrate_step)
+        hash = self._hash_function(key)
+        node = self._find_node(key, hash)
+        if node is not None:
+            node.value = value
+            return
+
+        index = hash % self._capacity
+        bucket = self._chain(index)
+        bucket.insert(key, value, hash)
+        self._size += 1
+        length = bucket.length()
+        self._count_chain(length - 1, length)
+        if length > TREEIFY_THRESHOLD:
+            self._fit_chain(index)
+
+        if self._size > self._capacity * self._max_load:
+            self.resize_table(next_prime(self._capacity * 2))
+
+    def get(self, key: str) -> object:
+        """
+        Returns the stored value associated with a given key. If value
+        is not present, returns None.
+        """
+        self._migrate(self._migrate_step)
+        node = self._find_node(key, self._hash_function(key))
+        return None if node is None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if given key is present in hash map, False otherwise.
+        """
+        self._migrate(self._migrate_step)
+        return self._find_node(key, self._hash_function(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key (and associated value) from hash map. If the key
+        is not present in the map, does nothing.
+        """
+        self._migrate(self._migrate_step)
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        bucket = self._chain(index)
+        if bucket.remove(key, hash):
+            length = bucket.length()
+            self._count_chain(length + 1, length)
+            if (isinstance(bucket, SortedChain)
+                    and bucket.length() <= UNTREEIFY_THRESHOLD):
+                self._fit_chain(index)
+        else:
+            old_bucket = self._old_bucket(hash)
+            if old_bucket is None or not old_bucket.remove(key, hash):
+                return
+            if old_bucket.length() == 0:
+                self._old_empty += 1
+
+        self._size -= 1
+        if (self._capacity > self._min_capacity
+                and self._size < self._capacity * self._min_load):
+            self.resize_table(max(self._min_capacity,
+                                  next_prime(self._capacity // 2)))
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of buckets in the current hash table which
+        contain no elements. While a resize is in progress, this counts
+        the empty buckets of both bucket arrays, leaving out old chains
+        that have already been migrated.
+        """
+        return self._chain_counts[0] + self._old_empty
+
+    def clear(self) -> None:
+        """
+        Empties the current hash table of its contents, abandoning any
+        resize in progress, while preserving its capacity.
+        """
+        if self._old_buckets is not None:
+            self._fill_chains(self._capacity)
+            self._old_buckets = None
+            self._old_empty = 0
+        super().clear()
+
+    def save(self, path: str) -> None:
+        """
+        Takes a path and writes the map to a binary snapshot file there, as
+        HashMap.save() does, after finishing any resize in progress.
+        """
+        self.finish_resize()
+        super().save(path)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns an unordered DynamicArray holding all keys currently in
+        hash map.
+        """
+        keys = DynamicArray()
+        for bucket in self._buckets.as_list():
+            if bucket is not None:
+                for node in bucket:
+                    keys.append(node.key)
+        if self._old_buckets is not None:
+            for index in range(self._migrate_index, self._old_capacity):
+                for node in self._old_buckets[index]:
+                    keys.append(node.key)
+        return keys
+
+    def _iter_items(self):
+        """
+        Helper method for the views that finishes any resize in progress,
+        so that lookups made while iterating cannot move chains, then
+        yields each pair as HashMap._iter_items() does.
+        """
+        self.finish_resize()
+        yield from super()._iter_items()
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them as put() would, one operation per pair.
+        """
+        for key, value in to_list(pairs):
+            self.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray([self.get(key) for key in to_list(keys)])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray([self.contains_key(key) for key in to_list(keys)])
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would, one operation per key.
+        """
+        for key in to_list(keys):
+            self.remove(key)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Starts resizing the hash table to given capacity. Only the new
+        bucket array is allocated here, without any chains; the existing
+        chains follow a few at a time. If a resize is already in progress,
+        the new array (holding just the chains migrated so far) is resized
+        outright instead, and the rest keep following from the old one.
+        Does nothing if provided capacity is < 1.
+        """
+        if new_capacity < 1:
+            return
+        start = time.perf_counter()
+
+        migrated = None
+        if self._old_buckets is None:
+            self._old_buckets = self._buckets
+            self._old_capacity = self._capacity
+            self._migrate_index = 0
+            self._old_empty = self._chain_counts[0]
+        else:
+            migrated = self._buckets.as_list()
+
+        self._capacity = new_capacity
+        self._buckets = DynamicArray()
+        self._buckets.as_list().extend(repeat(None, new_capacity))
+        self._filled = 0
+        self._chain_counts = [new_capacity]
+        self._sorted_chains = 0
+        self._version += 1
+
+        if migrated is not None:
+            for bucket in migrated:
+                if bucket is not None:
+                    for node in bucket:
+                        self._place(node)
+
+        if self._stats is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _old_bucket(self, hash: int):
+        """
+        Helper method that returns the old chain a hash belongs to, or None
+        if that chain has already been migrated (or no resize is running).
+        """
+        if self._old_buckets is None:
+            return None
+        index = hash % self._old_capacity
+        if index < self._migrate_index:
+            return None
+        return self._old_buckets[index]
+
+    def _find_node(self, key: str, hash: int) -> SLNode:
+        """
+        Helper method that returns the node holding key, searching the new
+        table and then the old one, or None if key is not present.
+        """
+        bucket = self._get_bucket(hash)
+        node = None if bucket is None else bucket.contains(key, hash)
+        if node is None:
+            old_bucket = self._old_bucket(hash)
+            if old_bucket is not None:
+                node = old_bucket.contains(key, hash)
+        return node
+
+    def _migrate(self, count: int) -> None:
+        """
+        Helper method that moves the next count chains of the old table into
+        the new one, and drops the old table once it has been drained.
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return
+        start = self._migrate_index
+        end = min(start + count, self._old_capacity)
+        for old_index in range(start, end):
+            chain = old_buckets[old_index]
+            if chain.length() == 0:
+                self._old_empty -= 1
+            for node in chain:
+                self._place(node)
+            old_buckets[old_index] = None
+
+        # Create the new array's remaining chains at the same pace, so the
+        # last are created as the last old chain is migrated
+        remaining = self._old_capacity - start
+        self._fill_chains(self._filled + -(-(end - start)
+                          * (self._capacity - self._filled) // remaining))
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _place(self, node: SLNode) -> None:
+        """
+        Helper method that inserts a node's entry into its chain in the new
+        array. Keys in the old array are never also in the new one, so no
+        search is needed.
+        """
+        index = node.hash % self._capacity
+        bucket = self._chain(index)
+        bucket.insert(node.key, node.value, node.hash)
+        length = bucket.length()
+        self._count_chain(length - 1, length)
+        if length > TREEIFY_THRESHOLD:
+            self._fit_chain(index)
+
+    def _chain(self, index: int):
+        """
+        Helper method that returns the chain at the given index of the new
+        array, creating it if it has not been created yet.
+        """
+        bucket = self._buckets.as_list()[index]
+        if bucket is None:
+            bucket = self._buckets.as_list()[index] = LinkedList()
         return bucket
 
+    def _get_bucket(self, hash: int):
+        """
+        Helper method for lookups that returns the chain for a hash in the
+        new array, or None if that chain has not been created yet.
+        """
+        bucket = self._buckets.as_list()[hash % self._capacity]
+        if self._stats is not None:
+            self._stats.record_probes(0 if bucket is None else bucket.length())
+        return bucket
+
+    def _fill_chains(self, end: int) -> None:
+        """
+        Helper method that creates every chain of the new array before the
+        given index that has not been created on demand already.
+        """
+        slots = self._buckets.as_list()
+        for index in range(self._filled, end):
+            if slots[index] is None:
+                slots[index] = LinkedList()
+        if end > self._filled:
+            self._filled = end
+
+
+class FrequencyCounter(HashMap):
+    """
+    A HashMap from keys to the number of times each has been counted, fed
+    one token at a time from any iterable or file. Each token costs one
+    hash and one chain walk, and the mode is kept up to date as counts
+    rise, so the stream is never held in memory: the map grows with the
+    number of distinct keys, not the length of the input.
+    """
+
+    def __init__(self, capacity: int = 11, function=None,
+                 max_load: float = 1.0, min_load: float = 0.25,
+                 seed: int = None) -> None:
+        """
+        Initialize a new, empty FrequencyCounter. Takes the same arguments
+        as HashMap, with a small default capacity since the table grows
+        as keys arrive.
+        """
+        super().__init__(max(capacity, 1), function, max_load, min_load, seed)
+        # Keys holding the highest count, in the order they reached it, or
+        # None once a change has made them stale
+        self._modes = {}
+        self._mode_count = 0
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Takes a key and a positive count, adds the count to the key's total
+        (starting from zero for a new key), and returns the new total.
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        bucket = self._buckets[index]
+        node = bucket.contains(key, hash)
+        if node is not None:
+            total = node.value = node.value + count
+        else:
+            total = count
+            bucket.insert(key, total, hash)
+            self._size += 1
+            length = bucket.length()
+            self._count_chain(length - 1, length)
+            if length > TREEIFY_THRESHOLD:
+                self._fit_chain(index)
+            if self._size > self._capacity * self._max_load:
+                self.resize_table(next_prime(self._capacity * 2))
+
+        self._track(key, total)
+        return total
+
+    def update(self, tokens) -> None:
+        """
+        Takes a DynamicArray or any other iterable of tokens (a generator,
+        a file's lines...) and counts each of them once.
+        """
+        if isinstance(tokens, DynamicArray):
+            tokens = tokens.as_list()
+        add = self.add
+        for key in tokens:
+            add(key)
+
+    def update_from_file(self, file, separator: str = None) -> None:
+        """
+        Takes an open text file (or a path to one) and counts every token
+        in it, splitting each line on separator (whitespace by default).
+        The file is read a line at a time.
+        """
+        if isinstance(file, str):
+            with open(file) as opened:
+                self.update_from_file(opened, separator)
+            return
+
+        add = self.add
+        for line in file:
+            line = line.rstrip('\r\n')
+            if line:
+                for key in line.split(separator):
+                    add(key)
+
+    def get_mode(self) -> (DynamicArray, int):
+        """
+        Returns a DynamicArray of the key or keys with the highest count,
+        along with that count. An empty counter returns no keys and 0.
+        """
+        if self._modes is None:
+            self._rescan_modes()
+        return DynamicArray(list(self._modes)), self._mode_count
+
+    def most_common(self, k: int) -> DynamicArray:
+        """
+        Takes a number k and returns a DynamicArray of the (key, count)
+        pairs for the k highest counts, highest first. Keys with equal
+        counts are in no particular order.
+        """
+        nodes = (node for i in range(self._capacity)
+                 for node in self._buckets[i])
+        top = heapq.nlargest(k, nodes, key=lambda node: node.value)
+        return DynamicArray([(node.key, node.value) for node in top])
+
+    @classmethod
+    def load(cls, path: str, function=None) -> "FrequencyCounter":
+        """
+        Takes the path of a snapshot written by save() and returns a new
+        counter holding its counts, as HashMap.load() does. The modes are
+        not saved, so they are recomputed on the next get_mode().
+        """
+        counter = super().load(path, function)
+        counter._modes = None
+        return counter
+
+    def put(self, key: str, value: int) -> None:
+        """
+        Takes a key and a count and sets the key's count to it, as
+        HashMap.put() does, keeping the mode up to date.
+        """
+        super().put(key, value)
+        self._track(key, value)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its count, as HashMap.remove() does.
+        """
+        super().remove(key)
+        if self._modes is not None and key in self._modes:
+            self._modes = None
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-count pairs and sets
+        each count as put() would.
+        """
+        super().put_many(pairs)
+        self._modes = None
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them as remove() would.
+        """
+        super().remove_many(keys)
+        self._modes = None
+
+    def clear(self) -> None:
+        """
+        Empties the counter, while preserving its capacity.
+        """
+        super().clear()
+        self._modes = {}
+        self._mode_count = 0
+
+    def _track(self, key: str, count: int) -> None:
+        """
+        Helper method that updates the modes after the given key's count
+        has been set to count. Lowering the count of a mode can't be
+        resolved without a scan, so it marks the modes as stale instead.
+        """
+        modes = self._modes
+        if modes is None:
+            return
+        if count > self._mode_count:
+            self._modes = {key: None}
+            self._mode_count = count
+        elif count == self._mode_count:
+            modes[key] = None
+        elif key in modes:
+            self._modes = None
+
+    def _rescan_modes(self) -> None:
+        """
+        Helper method that recomputes the modes from every count in the map.
+        """
+        modes = {}
+        mode_count = 0
+        for i in range(self._capacity):
+            for node in self._buckets[i]:
+                if node.value > mode_count:
+                    modes = {node.key: None}
+                    mode_count = node.value
+                elif node.value == mode_count:
+                    modes[node.key] = None
+        self._modes = modes
+        self._mode_count = mode_count
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
     Takes a DynamicArray and returns the element or elements with the
     highest frequency, along with the number of times they appear. 
     """
-    # Count each string's frequency and populate hashmap 
-    map = HashMap(da.length() // 3, hash_function_1)
-    for i in range(da.length()):
-        key = da[i]
-        count = map.get(key)
-        if count is None: 
-            map.put(key, 1)
-        else:
-            map.put(key, count + 1)
-
-    mode_strings = DynamicArray()
-    mode_count = 0   
-
-    # Iterate over strings in map, checking for highest freqeuency
-    map_keys = map.get_keys()
-    for i in range(map_keys.length()):
-        key = map_keys[i]
-        value = map.get(key)
-        # If higher than current highest, store as new mode 
-        if value > mode_count:
-            mode_strings = DynamicArray()
-            mode_strings.append(key)
-            mode_count = value
-        # If equal, add to list of current modes 
-        elif value == mode_count:
-            mode_strings.append(key)
-
-    return (mode_strings, mode_count)
+    counter = FrequencyCounter(function=hash_function_1)
+    counter.update(da)
+    return counter.get_mode()
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -414,3 +1341,27 @@ if __name__ == "__main__":
         map = HashMap(da.length() // 3, hash_function_2)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode: {mode}, Frequency: {frequency}\n")
+
+    print("\nremove_many example (min_capacity 1)")
+    print("-------------------------------------")
+    m = HashMap(1, hash_function_1)
+    keys = DynamicArray(['key' + str(i) for i in range(20)])
+    for i in range(keys.length()):
+        m.put(keys[i], i)
+    m.remove_many(keys)
+    print(m.get_size(), m.get_capacity())
+    assert m.get_size() == 0 and m.get_capacity() == 2
+
+    print("\nFrequencyCounter save and load")
+    print("------------------------------")
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'counter.bin')
+    counter = FrequencyCounter(function=hash_function_1)
+    counter.update(["apple", "apple", "grape", "melon", "melon", "peach"])
+    counter.save(path)
+    loaded = FrequencyCounter.load(path)
+    mode, frequency = loaded.get_mode()
+    print(f"Mode: {mode}, Frequency: {frequency}")
+    assert sorted(mode.as_list()) == ['apple', 'melon'] and frequency == 2
+    os.remove(path)
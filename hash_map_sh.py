@@ -0,0 +1,315 @@
+# Course: CS261 - Data Structures
+# Description: A hash map sharded across worker processes. Keys are
+#              partitioned by hash among N workers, each owning an ordinary
+#              open addressing or separate chaining HashMap. Batch
+#              operations are split by shard and sent to every worker
+#              before any reply is awaited, so the shards work in parallel
+#              and throughput scales with the number of cores.
+
+
+import multiprocessing
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_2, to_list
+
+
+_MODULES = {'oa': hash_map_oa, 'sc': hash_map_sc}
+
+
+def _serve(connection, kind: str, capacity: int, function, seed) -> None:
+    """
+    Worker process loop: owns one shard and answers each (method, args)
+    request with ('ok', result) or ('error', exception) until it receives
+    None. DynamicArray results are sent back as plain lists. The first
+    reply reports whether the shard's map could be constructed; if not,
+    the worker exits.
+    """
+    try:
+        map = _MODULES[kind].HashMap(capacity, function, seed=seed)
+    except Exception as error:
+        connection.send(('error', error))
+        connection.close()
+        return
+    connection.send(('ok', None))
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            result = getattr(map, method)(*args)
+            if isinstance(result, DynamicArray):
+                result = result.as_list()
+            connection.send(('ok', result))
+        except Exception as error:
+            connection.send(('error', error))
+    connection.close()
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=None, shards: int = None,
+                 kind: str = 'sc', seed: int = None) -> None:
+        """
+        Initialize new HashMap split across the given number of worker
+        processes (one per CPU by default), each owning a hash_map_oa or
+        hash_map_sc HashMap (kind 'oa' or 'sc') with an even share of the
+        capacity. Keys are assigned to shards by Python's builtin hash(),
+        so they must be hashable; function (and seed, as for those maps)
+        determines how each shard hashes them, and must be picklable.
+        """
+        if kind not in _MODULES:
+            raise ValueError(f"unknown shard kind: {kind!r}")
+        if shards is None:
+            shards = multiprocessing.cpu_count()
+        shard_capacity = max(1, -(-capacity // shards))
+
+        self._shards = shards
+        self._connections = []
+        self._processes = []
+        for _ in range(shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve, daemon=True,
+                args=(child, kind, shard_capacity, function, seed))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        # Wait for every shard's map to be constructed, so an error in its
+        # arguments is raised here rather than on the first request
+        error = None
+        for connection in self._connections:
+            status, result = connection.recv()
+            if status == 'error':
+                error = error or result
+        if error is not None:
+            self.close()
+            raise error
+
+    def __enter__(self) -> "HashMap":
+        """Return the map, to be closed on leaving the with block."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Shut down the worker processes."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes, discarding their contents. The map
+        cannot be used afterwards.
+        """
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._broadcast('get_size'))
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map: the total of every shard's capacity
+        """
+        return sum(self._broadcast('get_capacity'))
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key-value pair and stores it in the shard owning the key.
+        """
+        self._call(self._shard(key), 'put', key, value)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value stored with key, or None if it is not present.
+        """
+        return self._call(self._shard(key), 'get', key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if given key is present in hash map, False otherwise.
+        """
+        return self._call(self._shard(key), 'contains_key', key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key (and associated value) from hash map. If the key
+        is not present in the map, does nothing.
+        """
+        self._call(self._shard(key), 'remove', key)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets across all shards.
+        """
+        return sum(self._broadcast('empty_buckets'))
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the map as a whole.
+        """
+        return self.get_size() / self.get_capacity()
+
+    def clear(self) -> None:
+        """
+        Empties every shard, while preserving its capacity.
+        """
+        self._broadcast('clear')
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns an unordered DynamicArray holding all keys in every shard.
+        """
+        keys = []
+        for shard_keys in self._broadcast('get_keys'):
+            keys.extend(shard_keys)
+        return DynamicArray(keys)
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of key-value pairs and stores
+        each of them in its shard, all shards working at once.
+        """
+        batches = [[] for _ in range(self._shards)]
+        shards = self._shards
+        for pair in to_list(pairs):
+            batches[hash(pair[0]) % shards].append(pair)
+        self._scatter('put_many', [(batch,) if batch else None
+                                   for batch in batches])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of their values, with None for any key not found.
+        """
+        return DynamicArray(self._gather('get_many', to_list(keys)))
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Takes a DynamicArray (or any iterable) of keys and returns a
+        DynamicArray of booleans denoting whether each key is present.
+        """
+        return DynamicArray(self._gather('contains_many', to_list(keys)))
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes a DynamicArray (or any iterable) of keys and removes each of
+        them from its shard, all shards working at once.
+        """
+        batches = [[] for _ in range(self._shards)]
+        shards = self._shards
+        for key in to_list(keys):
+            batches[hash(key) % shards].append(key)
+        self._scatter('remove_many', [(batch,) if batch else None
+                                      for batch in batches])
+
+    def _shard(self, key: str) -> int:
+        """
+        Helper method returning the index of the shard that owns key.
+        """
+        return hash(key) % self._shards
+
+    def _receive(self, shard: int) -> object:
+        """
+        Helper method that waits for a shard's reply, and returns its result
+        or raises the exception it reported.
+        """
+        status, result = self._connections[shard].recv()
+        if status == 'error':
+            raise result
+        return result
+
+    def _call(self, shard: int, method: str, *args) -> object:
+        """
+        Helper method that calls a method on one shard's map and returns
+        its result.
+        """
+        self._connections[shard].send((method, args))
+        return self._receive(shard)
+
+    def _broadcast(self, method: str, *args) -> list:
+        """
+        Helper method that calls a method on every shard's map at once, and
+        returns the list of their results in shard order.
+        """
+        return self._scatter(method, [args] * self._shards)
+
+    def _scatter(self, method: str, requests: list) -> list:
+        """
+        Helper method that calls a method on each shard's map with that
+        shard's arguments (a tuple, or None to skip the shard), sending every
+        request before waiting for any reply. Returns the results by shard,
+        None for skipped shards. Every reply is collected even if one reports
+        an error, which is then raised.
+        """
+        sent = [shard for shard in range(self._shards)
+                if requests[shard] is not None]
+        for shard in sent:
+            self._connections[shard].send((method, requests[shard]))
+
+        results = [None] * self._shards
+        error = None
+        for shard in sent:
+            status, result = self._connections[shard].recv()
+            if status == 'error':
+                error = error or result
+            results[shard] = result
+        if error is not None:
+            raise error
+        return results
+
+    def _gather(self, method: str, keys: list) -> list:
+        """
+        Helper method that looks up keys with a batch method on every shard
+        at once, and returns the results in the order of the keys.
+        """
+        shards = self._shards
+        batches = [[] for _ in range(shards)]
+        owners = [hash(key) % shards for key in keys]
+        for key, shard in zip(keys, owners):
+            batches[shard].append(key)
+
+        results = self._scatter(method, [(batch,) if batch else None
+                                         for batch in batches])
+        positions = [0] * shards
+        values = []
+        for shard in owners:
+            values.append(results[shard][positions[shard]])
+            positions[shard] += 1
+        return values
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput_many and get_many")
+    print("---------------------")
+    with HashMap(100, hash_function_2, shards=4) as m:
+        m.put_many(DynamicArray([('str' + str(i), i) for i in range(1000)]))
+        m.remove('str7')
+        values = m.get_many(DynamicArray(['str' + str(i) for i in range(10)]))
+        print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+        print(values)
+
+    print("\nshard constructor errors are raised by the constructor")
+    print("------------------------------------------------------")
+    try:
+        HashMap(11, hash_function_2, seed=3, shards=2)
+    except ValueError as error:
+        print(error)
+    else:
+        raise AssertionError("seed with a function was accepted")
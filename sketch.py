@@ -0,0 +1,399 @@
+# Course: CS261 - Data Structures
+# Description: Approximate counting for streams with too many distinct keys
+#              to count exactly. CountMinSketch estimates the count of any
+#              key from a fixed grid of counters, and SpaceSaving keeps a
+#              fixed number of counters for the most frequent keys, which
+#              gives an approximate mode and top-k. Both take an error bound
+#              instead of a capacity, and sketches built with the same
+#              settings in different processes can be merged.
+
+
+import heapq
+import math
+import random
+from array import array
+from functools import partial
+from itertools import count as _sequence
+
+from a6_include import DynamicArray, mix_hash
+from hash_map_sc import HashMap
+
+
+class CountMinSketch:
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01,
+                 function=mix_hash, seed: int = None) -> None:
+        """
+        Initialize a new, empty Count-Min Sketch. With probability at least
+        1 - delta, an estimate exceeds the key's true count by at most
+        epsilon times the total of all counts, and it is never below the
+        true count. The sketch has ceil(e / epsilon) counters in each of
+        ceil(ln(1 / delta)) rows, however many keys are added.
+        The function must belong to a seeded family, taking the key and a
+        seed keyword (such as mix_hash or fnv1a_hash). Sketches can only be
+        merged if they were created with the same arguments, so give each
+        worker the same seed when counting in parallel.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        self._width = math.ceil(math.e / epsilon)
+        self._depth = math.ceil(math.log(1 / delta))
+        self._function = function
+        self._seed = seed if seed is not None else random.getrandbits(64)
+        self._total = 0
+
+        # Each row's column comes from the same two hashes, combined as
+        # h1 + row * h2, so a key costs two hashes however many rows there are
+        seeds = random.Random(self._seed)
+        self._hash_1 = partial(function, seed=seeds.getrandbits(64))
+        self._hash_2 = partial(function, seed=seeds.getrandbits(64))
+        self._counts = array('Q', bytes(8 * self._width * self._depth))
+
+    def get_width(self) -> int:
+        """
+        Return number of counters in each row
+        """
+        return self._width
+
+    def get_depth(self) -> int:
+        """
+        Return number of rows
+        """
+        return self._depth
+
+    def get_total(self) -> int:
+        """
+        Return the total of all counts added to the sketch
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Takes a key and a positive count, adds the count to the key's
+        counters, and returns the key's new estimated count.
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+        counts = self._counts
+        estimate = None
+        for index in self._indices(key):
+            value = counts[index] + count
+            counts[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self._total += count
+        return estimate
+
+    def update(self, tokens) -> None:
+        """
+        Takes a DynamicArray or any other iterable of tokens and counts each
+        of them once.
+        """
+        if isinstance(tokens, DynamicArray):
+            tokens = tokens.as_list()
+        add = self.add
+        for key in tokens:
+            add(key)
+
+    def estimate(self, key: str) -> int:
+        """
+        Returns the estimated count of the given key: never less than its
+        true count, and usually within error_bound() of it.
+        """
+        counts = self._counts
+        return min(counts[index] for index in self._indices(key))
+
+    def error_bound(self) -> float:
+        """
+        Returns the amount by which an estimate exceeds the true count with
+        probability at most delta, given the counts added so far.
+        """
+        return math.e * self._total / self._width
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """
+        Takes a sketch created with the same arguments (including the seed)
+        and adds its counts into this one, so that this sketch estimates
+        the combined stream.
+        """
+        if (self._width, self._depth, self._function, self._seed) != (
+                other._width, other._depth, other._function, other._seed):
+            raise ValueError("can only merge sketches created with the same "
+                             "epsilon, delta, function and seed")
+        counts = self._counts
+        for index, value in enumerate(other._counts):
+            if value:
+                counts[index] += value
+        self._total += other._total
+
+    def clear(self) -> None:
+        """
+        Resets every count to zero, keeping the sketch's size and hashes.
+        """
+        self._counts = array('Q', bytes(8 * self._width * self._depth))
+        self._total = 0
+
+    def _indices(self, key: str):
+        """
+        Helper method that yields the index in the counter array of the
+        given key's counter in each row.
+        """
+        width = self._width
+        column = self._hash_1(key)
+        step = self._hash_2(key) | 1
+        for offset in range(0, width * self._depth, width):
+            yield offset + column % width
+            column += step
+
+
+class SpaceSaving:
+    def __init__(self, epsilon: float = 0.001, function=None,
+                 seed: int = None) -> None:
+        """
+        Initialize a new, empty Space-Saving summary with ceil(1 / epsilon)
+        counters. A key's estimated count exceeds its true count by at most
+        epsilon times the total of all counts, and any key whose true count
+        is above that total times epsilon is guaranteed to be monitored.
+        Monitored keys are held in a separate chaining HashMap built with
+        function and seed (see hash_map_sc.HashMap).
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1")
+        self._counters = math.ceil(1 / epsilon)
+        self._total = 0
+
+        # Each monitored key maps to a [count, error] pair, where error is
+        # the count the key inherited when it displaced another
+        self._entries = HashMap(self._counters, function, seed=seed)
+
+        # One (count, sequence, key) tuple per monitored key. Counts only
+        # grow, so an entry's count may be stale but is never too high;
+        # _min_entry() refreshes entries until the smallest is current
+        self._heap = []
+        self._sequence = _sequence()
+
+    def get_counters(self) -> int:
+        """
+        Return the number of keys the summary can monitor
+        """
+        return self._counters
+
+    def get_size(self) -> int:
+        """
+        Return the number of keys currently monitored
+        """
+        return self._entries.get_size()
+
+    def get_total(self) -> int:
+        """
+        Return the total of all counts added to the summary
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Takes a key and a positive count, adds the count to the key's
+        estimate, and returns the new estimate. A key that is not monitored
+        while every counter is taken replaces the key with the smallest
+        count, inheriting that count as its error.
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+        self._total += count
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] += count
+            return entry[0]
+
+        if self._entries.get_size() < self._counters:
+            heapq.heappush(self._heap, (count, next(self._sequence), key))
+            self._entries.put(key, [count, 0])
+            return count
+
+        minimum, _, victim = self._min_entry()
+        self._entries.remove(victim)
+        estimate = minimum + count
+        heapq.heapreplace(self._heap,
+                          (estimate, next(self._sequence), key))
+        self._entries.put(key, [estimate, minimum])
+        return estimate
+
+    def update(self, tokens) -> None:
+        """
+        Takes a DynamicArray or any other iterable of tokens and counts each
+        of them once.
+        """
+        if isinstance(tokens, DynamicArray):
+            tokens = tokens.as_list()
+        add = self.add
+        for key in tokens:
+            add(key)
+
+    def estimate(self, key: str) -> int:
+        """
+        Returns the estimated count of the given key, which exceeds its true
+        count by at most error(key), or 0 if the key is not monitored.
+        """
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else 0
+
+    def error(self, key: str) -> int:
+        """
+        Returns the most by which the given key's estimate can exceed its
+        true count. For a key that is not monitored, this is the most times
+        it can have been seen.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry[1]
+        return self._floor()
+
+    def error_bound(self) -> float:
+        """
+        Returns the most by which any estimate can exceed the true count,
+        given the counts added so far.
+        """
+        return self._total / self._counters
+
+    def most_common(self, k: int) -> DynamicArray:
+        """
+        Takes a number k and returns a DynamicArray of the (key, estimate)
+        pairs for the k highest estimates, highest first.
+        """
+        pairs = self._pairs()
+        return DynamicArray(heapq.nlargest(k, pairs, key=lambda pair: pair[1]))
+
+    def get_mode(self) -> (DynamicArray, int):
+        """
+        Returns a DynamicArray of the key or keys with the highest estimate,
+        along with that estimate, in the same form as find_mode.
+        """
+        modes = DynamicArray()
+        mode_count = 0
+        for key, estimate in self._pairs():
+            if estimate > mode_count:
+                modes = DynamicArray()
+                mode_count = estimate
+            if estimate == mode_count:
+                modes.append(key)
+        return modes, mode_count
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Takes a summary with the same number of counters and merges its
+        counts into this one, so that this summary covers the combined
+        stream within the same error bound. A key missing from a full
+        summary is credited with that summary's smallest count, which is
+        the most it can have been seen there.
+        """
+        if self._counters != other._counters:
+            raise ValueError("can only merge summaries with the same number "
+                             "of counters")
+        own_floor = self._floor()
+        other_floor = other._floor()
+
+        merged = []
+        for key, (count, error) in self._entries.items():
+            theirs = other._entries.get(key)
+            if theirs is None:
+                theirs = (other_floor, other_floor)
+            merged.append((count + theirs[0], error + theirs[1], key))
+        for key, (count, error) in other._entries.items():
+            if key not in self._entries:
+                merged.append((count + own_floor, error + own_floor, key))
+
+        self._entries.clear()
+        self._heap = []
+        for count, error, key in heapq.nlargest(
+                self._counters, merged, key=lambda item: item[0]):
+            self._entries.put(key, [count, error])
+            self._heap.append((count, next(self._sequence), key))
+        heapq.heapify(self._heap)
+        self._total += other._total
+
+    def clear(self) -> None:
+        """
+        Forgets every key and count, keeping the number of counters.
+        """
+        self._entries.clear()
+        self._heap = []
+        self._total = 0
+
+    def _pairs(self):
+        """
+        Helper method that yields a (key, estimate) pair for each
+        monitored key.
+        """
+        for key, entry in self._entries.items():
+            yield key, entry[0]
+
+    def _min_entry(self) -> tuple:
+        """
+        Helper method that refreshes stale heap entries until the smallest
+        is current, and returns it.
+        """
+        heap = self._heap
+        while True:
+            stored, sequence, key = heap[0]
+            current = self._entries.get(key)[0]
+            if current == stored:
+                return heap[0]
+            heapq.heapreplace(heap, (current, sequence, key))
+
+    def _min_count(self) -> int:
+        """
+        Helper method that returns the smallest monitored count, or 0 if
+        the summary has no keys.
+        """
+        return self._min_entry()[0] if self._heap else 0
+
+    def _floor(self) -> int:
+        """
+        Helper method that returns the most times a key that is not
+        monitored can have been seen: the smallest count once every counter
+        is taken, and 0 before then.
+        """
+        if self._entries.get_size() < self._counters:
+            return 0
+        return self._min_count()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCountMinSketch example")
+    print("----------------------")
+    tokens = ['apple'] * 50 + ['grape'] * 20 + [str(i) for i in range(1000)]
+    sketch = CountMinSketch(epsilon=0.01, delta=0.01, seed=1)
+    sketch.update(tokens)
+    print(sketch.get_width(), sketch.get_depth(), sketch.get_total())
+    print(sketch.estimate('apple'), sketch.estimate('grape'),
+          sketch.estimate('melon'), sketch.error_bound())
+
+    print("\nSpaceSaving example")
+    print("-------------------")
+    summary = SpaceSaving(epsilon=0.02, seed=1)
+    summary.update(DynamicArray(tokens))
+    print(summary.get_counters(), summary.get_size(), summary.get_total())
+    mode, frequency = summary.get_mode()
+    print(f"Mode: {mode}, Frequency: {frequency}")
+    print(summary.most_common(2), summary.error('apple'),
+          summary.error_bound())
+
+    print("\nMerging example")
+    print("---------------")
+    left, right = CountMinSketch(0.01, seed=7), CountMinSketch(0.01, seed=7)
+    left.update(tokens[:500])
+    right.update(tokens[500:])
+    left.merge(right)
+    print(left.estimate('apple') == sketch.estimate('apple'), left.get_total())
+    left, right = SpaceSaving(0.02), SpaceSaving(0.02)
+    left.update(tokens[::2])
+    right.update(tokens[1::2])
+    left.merge(right)
+    print(left.most_common(2), left.get_total())